@@ -163,6 +163,15 @@ class EightPuzzleState:
     def __hash__(self):
         return hash(str(self.cells))
 
+    def pack(self):
+        """
+          Returns the puzzle as a single integer (see PackedEightPuzzleSearchProblem).
+
+        >>> unpackEightPuzzle(loadEightPuzzle(3).pack()) == loadEightPuzzle(3)
+        True
+        """
+        return packEightPuzzle([number for row in self.cells for number in row])
+
     def __getAsciiString(self):
         """
           Returns a display string for the maze
@@ -196,7 +205,11 @@ class EightPuzzleSearchProblem(search.SearchProblem):
         self.puzzle = puzzle
 
     def getStartState(self):
-        return puzzle
+        return self.puzzle
+
+    def getStateKey(self, state):
+        "A cheap canonical key for the state, used by search.HeuristicCache"
+        return state.pack()
 
     def isGoalState(self,state):
         return state.isGoal()
@@ -221,6 +234,69 @@ class EightPuzzleSearchProblem(search.SearchProblem):
         """
         return len(actions)
 
+# Packed encoding: the number in cell i (cells counted row by row) is kept in
+# bits 4*i .. 4*i+3 and the cell of the blank in bits 36 .. 39.
+BLANK_SHIFT = 36
+
+def packEightPuzzle(numbers):
+    "Packs a list of the nine numbers, cell by cell, into an integer."
+    code = numbers.index(0) << BLANK_SHIFT
+    for cell, number in enumerate(numbers):
+        code |= number << (4 * cell)
+    return code
+
+def unpackEightPuzzle(code):
+    "Returns the EightPuzzleState of a packed puzzle."
+    return EightPuzzleState([(code >> (4 * cell)) & 15 for cell in range(9)])
+
+PACKED_GOAL = packEightPuzzle([0, 1, 2, 3, 4, 5, 6, 7, 8])
+
+def _packedMoves():
+    """
+    For every cell of the blank, the legal moves (in legalMoves order) as
+    (move, 4 * blank cell, 4 * target cell, change of the blank field).
+    """
+    table = []
+    for blank in range(9):
+        row, col = divmod(blank, 3)
+        moves = []
+        for move, legal, target in [('up', row != 0, blank - 3), ('down', row != 2, blank + 3),
+                                    ('left', col != 0, blank - 1), ('right', col != 2, blank + 1)]:
+            if legal:
+                moves.append((move, 4 * blank, 4 * target, (target - blank) << BLANK_SHIFT))
+        table.append(tuple(moves))
+    return table
+
+PACKED_MOVES = _packedMoves()
+
+class PackedEightPuzzleSearchProblem(EightPuzzleSearchProblem):
+    """
+      The EightPuzzleSearchProblem with every state packed into one integer
+      (see packEightPuzzle).  A move is a lookup in PACKED_MOVES and a few
+      shifts, and states hash and compare as plain ints, so a sweep over all
+      181,440 reachable puzzles stays small and fast.  Use
+      unpackEightPuzzle to turn a state back into an EightPuzzleState.
+    """
+    def __init__(self, puzzle):
+        EightPuzzleSearchProblem.__init__(self, puzzle)
+        self.start = puzzle.pack()
+
+    def getStartState(self):
+        return self.start
+
+    def getStateKey(self, state):
+        return state
+
+    def isGoalState(self, state):
+        return state == PACKED_GOAL
+
+    def getSuccessors(self, state):
+        succ = []
+        for move, blankShift, targetShift, blankDelta in PACKED_MOVES[state >> BLANK_SHIFT]:
+            tile = (state >> targetShift) & 15
+            succ.append((state + (tile << blankShift) - (tile << targetShift) + blankDelta, move, 1))
+        return succ
+
 EIGHT_PUZZLE_DATA = [[1, 0, 2, 3, 4, 5, 6, 7, 8],
                      [1, 7, 8, 2, 3, 4, 5, 6, 0],
                      [4, 3, 2, 7, 0, 5, 1, 6, 8],
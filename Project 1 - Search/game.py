@@ -190,6 +190,7 @@ class Grid:
 
     def __eq__(self, other):
         if other == None: return False
+        if isinstance(other, PackedGrid): return other == self
         return self.data == other.data
 
     def __hash__(self):
@@ -274,6 +275,134 @@ class Grid:
                 bools.append(False)
         return bools
 
+class PackedGrid(Grid):
+    """
+    A Grid of booleans packed into a single Python int, with the bit for
+    (x,y) at index x * height + y.  It keeps the grid[x][y] interface (reads
+    and writes go through a column view made on each grid[x]) but the operations that walk
+    a list-of-lists Grid become int operations: copy() shares the immutable
+    int until one of the copies is written to, count() is a popcount,
+    asList() only visits set bits, and equality and hashing compare and hash
+    one int.  The hash is the same value Grid computes for the same cells.
+
+    Unlike Grid it can only hold booleans, and shallowCopy() is the same as
+    copy(): writes are never shared between two PackedGrids.
+    """
+    def __init__(self, width, height, initialValue=False, bitRepresentation=None):
+        if initialValue not in [False, True]:
+            raise Exception('Grids can only contain booleans')
+        self.CELLS_PER_INT = 30
+
+        self.width = width
+        self.height = height
+        self.bits = (1 << (width * height)) - 1 if initialValue else 0
+        self._hash = None
+        if bitRepresentation:
+            self._unpackBits(bitRepresentation)
+
+    def fromGrid(grid):
+        "Returns a PackedGrid holding the same cells as grid"
+        packed = PackedGrid(grid.width, grid.height)
+        for x, y in grid.asList():
+            packed.bits |= 1 << (x * grid.height + y)
+        return packed
+    fromGrid = staticmethod(fromGrid)
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.width:
+            if not -self.width <= i < 0:
+                raise IndexError('grid index out of range')
+            i += self.width
+        return PackedGridColumn(self, i * self.height)
+
+    def __setitem__(self, key, item):
+        column = self[key]
+        for y in range(self.height):
+            column[y] = item[y]
+
+    def __iter__(self):
+        return iter(self[x] for x in range(self.width))
+
+    def _set(self, index, value):
+        bit = 1 << index
+        if value:
+            self.bits |= bit
+        else:
+            self.bits &= ~bit
+        self._hash = None
+
+    def __str__(self):
+        out = [[str(self[x][y])[0] for x in range(self.width)] for y in range(self.height)]
+        out.reverse()
+        return '\n'.join([''.join(x) for x in out])
+
+    def __eq__(self, other):
+        if other == None:
+            return False
+        if isinstance(other, PackedGrid):
+            return self.bits == other.bits and self.height == other.height
+        return self.asList() == other.asList() and self.height == other.height
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(self.bits)
+        return self._hash
+
+    def copy(self):
+        g = PackedGrid(self.width, self.height)
+        g.bits = self.bits
+        g._hash = self._hash
+        return g
+
+    def deepCopy(self):
+        return self.copy()
+
+    def shallowCopy(self):
+        return self.copy()
+
+    def count(self, item=True):
+        ones = self.bits.bit_count()
+        if item:
+            return ones
+        return self.width * self.height - ones
+
+    def asList(self, key=True):
+        if not key:
+            return [(x, y) for x in range(self.width) for y in range(self.height) if not self[x][y]]
+        list = []
+        bits = self.bits
+        while bits:
+            low = bits & -bits
+            index = low.bit_length() - 1
+            list.append((index // self.height, index % self.height))
+            bits ^= low
+        return list
+
+class PackedGridColumn:
+    "Column view of a PackedGrid, so that grid[x][y] reads and writes bits."
+    __slots__ = ('grid', 'base')
+
+    def __init__(self, grid, base):
+        self.grid = grid
+        self.base = base
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.grid.height:
+            if not -self.grid.height <= y < 0:
+                raise IndexError('grid index out of range')
+            y += self.grid.height
+        return (self.grid.bits >> (self.base + y)) & 1 == 1
+
+    def __setitem__(self, y, value):
+        if not 0 <= y < self.grid.height:
+            if not -self.grid.height <= y < 0:
+                raise IndexError('grid index out of range')
+            y += self.grid.height
+        self.grid._set(self.base + y, value)
+
+    def __len__(self):
+        return self.grid.height
+
 def reconstituteGrid(bitRep):
     if type(bitRep) is not type((1,2)):
         return bitRep
@@ -0,0 +1,206 @@
+# patternDatabase.py
+# ------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Additive pattern databases for the sliding tile puzzles (the eight puzzle in
+eightpuzzle.py, and the same rules on larger boards such as the 15-puzzle).
+
+A pattern database for a group of tiles stores, for every placement of
+those tiles, the fewest moves of those tiles needed to bring them home when
+the blank and all other tiles are ignored (a tile of the group may slide
+into any neighbouring cell not held by another tile of the group).  When the
+groups are disjoint the values of all groups can be added, and the sum is
+an admissible and consistent heuristic.
+
+Boards are numbered row by row.  The goal has the blank (0) in cell 0 and
+tile t in cell t, as in EightPuzzleState.isGoal.
+"""
+
+import os
+import time
+from collections import deque
+
+PATTERN_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'patternCache')
+
+# Tile groups used when none are given, by board size
+DEFAULT_PARTITIONS = {
+    3: [(1, 2, 3, 4), (5, 6, 7, 8)],
+    4: [(1, 2, 3, 4), (5, 6, 7, 8), (9, 10, 11, 12), (13, 14, 15)],
+}
+
+UNKNOWN = 255
+
+def boardNeighbors(size):
+    "Returns, for every cell of a size x size board, the cells next to it."
+    neighbors = []
+    for cell in range(size * size):
+        row, col = divmod(cell, size)
+        adjacent = []
+        if row > 0: adjacent.append(cell - size)
+        if row < size - 1: adjacent.append(cell + size)
+        if col > 0: adjacent.append(cell - 1)
+        if col < size - 1: adjacent.append(cell + 1)
+        neighbors.append(adjacent)
+    return neighbors
+
+def flatten(state, size):
+    """
+    Returns the tiles of a puzzle state as a flat list, cell by cell.  Accepts
+    anything with a 'cells' list of rows (EightPuzzleState), a flat sequence
+    of numbers, or an integer holding one 4-bit number per cell with cell 0
+    in the lowest bits (as PackedEightPuzzleSearchProblem states do).
+    """
+    if isinstance(state, int):
+        return [(state >> (4 * cell)) & 15 for cell in range(size * size)]
+    if hasattr(state, 'cells'):
+        return [number for row in state.cells for number in row]
+    return list(state)
+
+class PatternDatabase:
+    """
+    The pattern database of one group of tiles on a size x size board.
+
+    Entries live in a bytearray indexed by the cells of the group's tiles
+    read as a number in base size*size, so a lookup is a few multiplications
+    and one index.  The table is built by a breadth first search backwards
+    from the goal placement and saved in cacheDir; pass cacheDir=None to
+    keep it in memory only.
+    """
+    def __init__(self, size, tiles, cacheDir=PATTERN_CACHE_DIR):
+        self.size = size
+        self.tiles = tuple(tiles)
+        self.table = None
+        if cacheDir is not None:
+            self.table = self._load(cacheDir)
+        if self.table is None:
+            self.table = self._build()
+            if cacheDir is not None:
+                self._save(cacheDir)
+
+    def index(self, where):
+        "where[t] is the cell holding tile t"
+        cells = self.size * self.size
+        key = 0
+        for tile in self.tiles:
+            key = key * cells + where[tile]
+        return key
+
+    def lookup(self, where):
+        return self.table[self.index(where)]
+
+    def _build(self):
+        """
+        Breadth first search over placements of the group's tiles, ignoring
+        the blank and every other tile: one move slides a tile of the group
+        into a neighbouring cell not held by another tile of the group, at
+        cost 1.  A real move changes the placement of at most one group by
+        one such move, so the sum over disjoint groups changes by at most 1
+        per move.
+        """
+        cells = self.size * self.size
+        neighbors = boardNeighbors(self.size)
+        k = len(self.tiles)
+        weights = [cells ** (k - 1 - j) for j in range(k)]  # index = sum(cell * weight)
+        table = bytearray([UNKNOWN]) * (cells ** k)
+
+        start = sum(tile * weight for tile, weight in zip(self.tiles, weights))
+        table[start] = 0
+        queue = deque([start])
+        while (queue):
+            key = queue.popleft()
+            cost = table[key] + 1
+            where = [(key // weight) % cells for weight in weights]
+            for j in range(k):
+                for cell in neighbors[where[j]]:
+                    if (cell in where): continue
+                    next_key = key + (cell - where[j]) * weights[j]
+                    if (table[next_key] == UNKNOWN):
+                        table[next_key] = cost
+                        queue.append(next_key)
+        return table
+
+    def _cachePath(self, cacheDir):
+        name = 'apdb-%d-%s.bin' % (self.size, '-'.join(str(tile) for tile in self.tiles))
+        return os.path.join(cacheDir, name)
+
+    def _load(self, cacheDir):
+        path = self._cachePath(cacheDir)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                table = bytearray(f.read())
+        except OSError:
+            return None
+        if len(table) != (self.size * self.size) ** len(self.tiles):
+            return None
+        return table
+
+    def _save(self, cacheDir):
+        try:
+            os.makedirs(cacheDir, exist_ok=True)
+            with open(self._cachePath(cacheDir), 'wb') as f:
+                f.write(self.table)
+        except OSError:
+            pass
+
+class AdditivePatternHeuristic:
+    """
+    The sum of the pattern databases of a partition of the tiles, usable as
+    the heuristic of aStarSearch or iterativeDeepeningAStarSearch:
+
+      heuristic = AdditivePatternHeuristic(3)
+      search.aStarSearch(EightPuzzleSearchProblem(puzzle), heuristic)
+
+    partition defaults to DEFAULT_PARTITIONS[size]; it must not repeat a
+    tile, and tiles left out of every group simply contribute nothing.
+    """
+    def __init__(self, size=3, partition=None, cacheDir=PATTERN_CACHE_DIR):
+        if partition is None:
+            partition = DEFAULT_PARTITIONS[size]
+        tiles = [tile for group in partition for tile in group]
+        if len(tiles) != len(set(tiles)) or not all(0 < tile < size * size for tile in tiles):
+            raise ValueError('partition must use distinct tiles between 1 and %d' % (size * size - 1))
+        self.size = size
+        self.databases = [PatternDatabase(size, group, cacheDir) for group in partition]
+
+    def __call__(self, state, problem=None):
+        numbers = flatten(state, self.size)
+        where = [0] * len(numbers)
+        for cell, number in enumerate(numbers):
+            where[number] = cell
+        return sum(database.lookup(where) for database in self.databases)
+
+_eightPuzzleHeuristic = None
+
+def eightPuzzleHeuristic(state, problem=None):
+    "The default additive pattern database heuristic for the eight puzzle."
+    global _eightPuzzleHeuristic
+    if _eightPuzzleHeuristic is None:
+        _eightPuzzleHeuristic = AdditivePatternHeuristic(3)
+    return _eightPuzzleHeuristic(state, problem)
+
+if __name__ == '__main__':
+    import eightpuzzle
+    import search
+
+    start = time.time()
+    eightPuzzleHeuristic(eightpuzzle.loadEightPuzzle(0))
+    print('Pattern databases ready in %.3f seconds' % (time.time() - start))
+    for i in range(5):
+        puzzle = eightpuzzle.createRandomEightPuzzle(1000)
+        problem = eightpuzzle.PackedEightPuzzleSearchProblem(puzzle)
+        for name, fn in [('A*', search.aStarSearch), ('IDA*', search.iterativeDeepeningAStarSearch)]:
+            path = fn(problem, eightPuzzleHeuristic)
+            print('%-5s %2d moves: %s' % (name, len(path), search.lastResult))
@@ -20,6 +20,11 @@ Pacman agents (in searchAgents.py).
 from genericpath import exists
 from re import S
 from typing import Tuple
+from collections import deque, OrderedDict
+import heapq
+import itertools
+import os
+import time
 import util
 
 class SearchProblem:
@@ -71,127 +76,302 @@ def tinyMazeSearch(problem):
     w = Directions.WEST
     return  [s, s, w, s, w, w, s, w]
 
-def depthFirstSearch(problem):
-    """Search the deepest nodes in the search tree first."""
-    
-    # Needed data structures
-    st = util.Stack()
-    parent = dict()
-    steps = list()
-    have_visited = set()
+class SearchNode:
+    """
+    A node of the search tree: a state together with the back-pointer, the
+    action and the path cost that reached it.  The engine creates one of
+    these for every generated successor, so it is kept as small as possible.
+    """
+    __slots__ = ('state', 'parent', 'action', 'cost')
 
-    start_state = (problem.getStartState(), None, None)
-    st.push(start_state)
-    
-    while (not st.isEmpty()):
-        state = st.pop()
-        have_visited.add(state[0])  # Visit the current state
+    def __init__(self, state, parent=None, action=None, cost=0):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.cost = cost
 
-        # Found goal state
-        if (problem.isGoalState(state[0])):
+    def path(self):
+        """
+        Follows the back-pointers up to the root and returns the actions in
+        the order they have to be taken.
+        """
+        steps = list()
+        node = self
+        while (node.parent is not None):
+            steps.append(node.action)
+            node = node.parent
+        steps.reverse()
+        return steps
 
-            # Trace back the path and reverse it to get the correct sequence of steps
-            while (state != start_state):
-                steps.append(state[1])
-                state = parent[state]
-            
-            steps.reverse()
-            return steps
+class SearchResult:
+    """
+    The outcome of a search together with its statistics.
 
-        # Expand successors
-        successors = problem.getSuccessors(state[0])
-        for successor in successors:
-            if (successor[0] not in have_visited):
-                parent[successor] = state
-                st.push(successor)
-    
-    # Solution/Path does not exist
-    return None
-    
+      path:        list of actions reaching a goal (None if there is no path)
+      cost:        total cost of path
+      expanded:    number of nodes whose successors were generated
+      generated:   number of successor nodes that entered the frontier
+      maxFrontier: largest size the frontier reached (for IDA* the deepest path,
+                   for SMA* the most nodes held in memory)
+      time:        wall-clock seconds spent searching
+      heuristicHits, heuristicMisses:
+                   lookups answered by / computed for the HeuristicCache
+      strategy:    for portfolioSearch, the name of the strategy that won
+      bound:       for anytime searches, how many times the optimal cost the
+                   path may cost at most (1 means it is optimal)
+    """
+    def __init__(self):
+        self.path = None
+        self.cost = None
+        self.expanded = 0
+        self.generated = 0
+        self.maxFrontier = 0
+        self.time = 0.0
+        self.heuristicHits = 0
+        self.heuristicMisses = 0
+        self.strategy = None
+        self.bound = None
 
-def breadthFirstSearch(problem):
-    """Search the shallowest nodes in the search tree first."""
+    def __str__(self):
+        text = 'cost %s, %d expanded, %d generated, peak frontier %d, %.3f seconds' % \
+            (self.cost, self.expanded, self.generated, self.maxFrontier, self.time)
+        if (self.heuristicHits or self.heuristicMisses):
+            text += ', heuristic cache %d hits / %d misses' % (self.heuristicHits, self.heuristicMisses)
+        if (self.strategy is not None):
+            text += ', found by %s' % self.strategy
+        if (self.bound is not None):
+            text += ', suboptimality bound %.2f' % self.bound
+        return text
 
-    # Needed data structures
-    Q = util.Queue()
-    parent = dict()
-    steps = list()
-    have_visited = set()
+# The result of the most recent bestFirstSearch call, for reporting purposes
+lastResult = None
 
-    start_state = (problem.getStartState(), None, None)
-    have_visited.add(start_state[0])
-    parent[start_state] = None
-    Q.push(start_state)
-    
-    while (not Q.isEmpty()):
-        state = Q.pop()
+"""
+ Frontier strategies for bestFirstSearch.  Each one holds SearchNodes and
+ decides, through admits, whether a newly generated node for a state should
+ enter the frontier given the best node reached for that state so far
+ (None if the state has not been reached yet).
+"""
 
-        # Found goal state
-        if (problem.isGoalState(state[0])):
+class StackFrontier:
+    "LIFO frontier: a state may be on the stack several times, stale copies are skipped when popped."
+    def __init__(self):
+        self.list = []
 
-            # Trace back the path and reverse it to get the correct sequence of steps
-            while (state != start_state):
-                steps.append(state[1])
-                state = parent[state]
-            
-            steps.reverse()
-            return steps
+    def push(self, node, priority):
+        self.list.append(node)
 
-        # Expand successors
-        successors = problem.getSuccessors(state[0])
-        for successor in successors:
-            if (successor[0] not in have_visited):
-                Q.push(successor)
-                parent[successor] = state
-                have_visited.add(successor[0])  # Visit the current state
-    
-    # Solution/Path does not exist
-    return None
-    
-
-def uniformCostSearch(problem):
-    """Search the node of least total cost first."""
-
-    # Needed data structures
-    from util import PriorityQueue
-    PQ = util.PriorityQueue()
-    have_visited = set()
+    def pop(self):
+        return self.list.pop()
+
+    def isEmpty(self):
+        return len(self.list) == 0
+
+    def __len__(self):
+        return len(self.list)
+
+    def admits(self, node, previous):
+        return True
+
+class QueueFrontier:
+    "FIFO frontier: a state enters the queue only the first time it is reached."
+    def __init__(self):
+        self.queue = deque()
+
+    def push(self, node, priority):
+        self.queue.append(node)
+
+    def pop(self):
+        return self.queue.popleft()
 
-    PQ.push((problem.getStartState(), list()), 0)
+    def isEmpty(self):
+        return len(self.queue) == 0
+
+    def __len__(self):
+        return len(self.queue)
+
+    def admits(self, node, previous):
+        return previous is None
+
+class PriorityFrontier:
+    """
+    Lowest-priority-first frontier backed by util.IndexedPriorityQueue.  It
+    holds one node per state, and a cheaper path to a queued state replaces
+    the queued node (decrease-key).
+    """
+    def __init__(self, lazy=False):
+        self.queue = util.IndexedPriorityQueue(lazy)
+        self.nodes = dict()
+
+    def push(self, node, priority):
+        self.nodes[node.state] = node
+        self.queue.push(node.state, priority)
+
+    def pop(self):
+        return self.nodes.pop(self.queue.pop())
+
+    def isEmpty(self):
+        return self.queue.isEmpty()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def admits(self, node, previous):
+        return previous is None or node.cost < previous.cost
+
+class BucketFrontier:
+    """
+    Frontier backed by util.BucketQueue, for problems whose step costs (and
+    heuristic values) are small non-negative integers, as in every maze
+    problem in searchAgents.py.  Nodes of equal priority are ordered by the
+    heuristic part of the priority, lowest first, which makes A* prefer the
+    deeper of two equally promising nodes.
+
+    Priorities that do not fit in a bucket (non-integers, negative values or
+    values above BUCKET_LIMIT) raise a ValueError, unless fallback is set:
+    then the frontier moves everything it holds into a PriorityFrontier and
+    behaves like one from then on.
+    """
+    BUCKET_LIMIT = 1 << 16
+
+    def __init__(self, fallback=False):
+        self.queue = util.BucketQueue()
+        self.nodes = dict()
+        self.fallback = fallback
+        self.heap = None  # the PriorityFrontier taking over after a fallback
+
+    def push(self, node, priority):
+        if self.heap is not None:
+            self.heap.push(node, priority)
+            return
+        if type(priority) is not int or type(node.cost) is not int or \
+                not 0 <= node.cost <= priority <= BucketFrontier.BUCKET_LIMIT:
+            if not self.fallback:
+                raise ValueError('BucketFrontier needs small non-negative integer priorities, got %s' % priority)
+            self._switchToHeap()
+            self.heap.push(node, priority)
+            return
+        self.nodes[node.state] = node
+        self.queue.push(node.state, priority, priority - node.cost)
+
+    def _switchToHeap(self):
+        self.heap = PriorityFrontier()
+        while not self.queue.isEmpty():
+            priority, state = self.queue.popWithPriority()
+            self.heap.push(self.nodes.pop(state), priority)
+
+    def pop(self):
+        if self.heap is not None:
+            return self.heap.pop()
+        return self.nodes.pop(self.queue.pop())
+
+    def isEmpty(self):
+        if self.heap is not None:
+            return self.heap.isEmpty()
+        return self.queue.isEmpty()
+
+    def __len__(self):
+        if self.heap is not None:
+            return len(self.heap)
+        return len(self.queue)
+
+    def admits(self, node, previous):
+        return previous is None or node.cost < previous.cost
+
+def makePriorityFrontier(queue='auto'):
+    """
+    Builds the frontier for uniformCostSearch and aStarSearch:
+      'heap':   PriorityFrontier (binary heap, any priorities)
+      'lazy':   PriorityFrontier whose heap uses lazy deletion: a cheaper
+                path pushes a new entry and the stale one is skipped on pop
+      'bucket': BucketFrontier (small integer priorities only)
+      'auto':   BucketFrontier that falls back to the heap as soon as a
+                priority is not a small integer
+    """
+    if queue == 'heap':
+        return PriorityFrontier()
+    if queue == 'lazy':
+        return PriorityFrontier(lazy=True)
+    if queue == 'bucket':
+        return BucketFrontier()
+    if queue == 'auto':
+        return BucketFrontier(fallback=True)
+    raise ValueError('Unknown priority queue type: %s' % queue)
+
+def bestFirstSearch(problem, frontier, heuristic=None, costWeight=1):
+    """
+    Generic graph search shared by all the algorithms below.
+
+    Nodes are taken out of frontier in the order it decides, goal-tested when
+    popped, and expanded at most once per state.  If a heuristic is given
+    the priority of a node is costWeight times its path cost plus the
+    heuristic, otherwise it is just the path cost (frontiers that do not
+    order by priority ignore it).  Returns a SearchResult, which is also kept
+    in search.lastResult.
+    """
+    global lastResult
+    startTime = time.time()
+    result = SearchResult()
 
-    while(not PQ.isEmpty()):
-        state, path = PQ.pop()  # Take current state and path
+    root = SearchNode(problem.getStartState())
+    reached = {root.state: root}  # state -> best node found for it so far
+    have_visited = set()
+    if heuristic is None:
+        frontier.push(root, 0)
+    else:
+        frontier.push(root, costWeight * root.cost + heuristic(root.state, problem))
+    maxFrontier = 1
+
+    while (not frontier.isEmpty()):
+        node = frontier.pop()
+        state = node.state
+        if (state in have_visited): continue  # stale duplicate
         have_visited.add(state)  # Visit the current state
 
         # Found goal state
-        if (problem.isGoalState(state)): return path
-        
-        successors = problem.getSuccessors(state)
-        for successor in successors:
-
-            # Already have visited the particular node
-            if (successor[0] in have_visited): continue
-            
-            # Search to see if successor already exists in the frontier(PQ)
-            frontier_exists = False
-            for element in PQ.heap:
-                if (successor[0] == element[2][0]):
-                    frontier_exists = True
-                    break
-            
-            new_path = path + [successor[1]]
-            new_priority = problem.getCostOfActions(new_path)
-            
-            # State does not exist either in searched state nor in the frontier, insert it
-            if (not frontier_exists):
-                PQ.push((successor[0], new_path), new_priority)
-            
-            # Successor exists in the frontier with a higher path cost - update its path cost
-            elif (problem.getCostOfActions(element[2][1]) > new_priority):
-                PQ.update((successor[0], new_path), new_priority)
-    
-    # Solution/Path does not exist
-    return None
+        if (problem.isGoalState(state)):
+            result.path = node.path()
+            result.cost = node.cost
+            break
+
+        # Expand successors
+        result.expanded += 1
+        for next_state, action, step_cost in problem.getSuccessors(state):
+            if (next_state in have_visited): continue
+
+            child = SearchNode(next_state, node, action, node.cost + step_cost)
+            if (not frontier.admits(child, reached.get(next_state))): continue
+
+            reached[next_state] = child
+            if heuristic is None:
+                frontier.push(child, child.cost)
+            else:
+                frontier.push(child, costWeight * child.cost + heuristic(next_state, problem))
+            result.generated += 1
+
+        if (len(frontier) > maxFrontier): maxFrontier = len(frontier)
+
+    result.maxFrontier = maxFrontier
+    result.time = time.time() - startTime
+    recordHeuristicStatistics(result, heuristic)
+    lastResult = result
+    return result
+
+def depthFirstSearch(problem):
+    """Search the deepest nodes in the search tree first."""
+    return bestFirstSearch(problem, StackFrontier()).path
+
+def breadthFirstSearch(problem):
+    """Search the shallowest nodes in the search tree first."""
+    return bestFirstSearch(problem, QueueFrontier()).path
+
+def uniformCostSearch(problem, queue='auto'):
+    """
+    Search the node of least total cost first.
+
+    queue selects the frontier, see makePriorityFrontier.
+    """
+    return bestFirstSearch(problem, makePriorityFrontier(queue)).path
 
 def nullHeuristic(state, problem=None):
     """
@@ -200,56 +380,917 @@ def nullHeuristic(state, problem=None):
     """
     return 0
 
-def aStarSearch(problem: SearchProblem, heuristic=nullHeuristic):
-    """Search the node that has the lowest combined cost and heuristic first."""
-    
-    # Needed data structures
-    from util import PriorityQueue
-    PQ = util.PriorityQueue()
-    have_visited = set()
+# Default number of heuristic values a HeuristicCache keeps
+HEURISTIC_CACHE_SIZE = 100000
+
+class HeuristicCache:
+    """
+    Remembers the values of a heuristic so that a state reached again (with
+    a lower cost, in a later IDA* iteration, or after SMA* forgot it) does
+    not pay for the heuristic twice.
+
+    Values are keyed by problem.getStateKey(state) if the problem defines
+    it, otherwise by the state itself; a problem whose states are costly to
+    hash or compare can return a cheaper canonical key there.  When more
+    than maxSize values are held the least recently used one is dropped.
+    The heuristic must not depend on anything but the state.
+    """
+    def __init__(self, heuristic, problem, maxSize=HEURISTIC_CACHE_SIZE):
+        self.heuristic = heuristic
+        self.getKey = getattr(problem, 'getStateKey', None)
+        self.maxSize = maxSize
+        self.values = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, state, problem=None):
+        key = state if self.getKey is None else self.getKey(state)
+        values = self.values
+        if key in values:
+            self.hits += 1
+            values.move_to_end(key)
+            return values[key]
+        self.misses += 1
+        value = self.heuristic(state, problem)
+        values[key] = value
+        if (len(values) > self.maxSize): values.popitem(last=False)
+        return value
+
+def cachedHeuristic(heuristic, problem, cacheSize):
+    "Wraps heuristic in a HeuristicCache, unless cacheSize is 0 or there is nothing to save."
+    if (not cacheSize or heuristic is None or heuristic is nullHeuristic): return heuristic
+    return HeuristicCache(heuristic, problem, cacheSize)
+
+def recordHeuristicStatistics(result, heuristic):
+    if isinstance(heuristic, HeuristicCache):
+        result.heuristicHits, result.heuristicMisses = heuristic.hits, heuristic.misses
+
+def aStarSearch(problem: SearchProblem, heuristic=nullHeuristic, queue='auto', cacheSize=0):
+    """
+    Search the node that has the lowest combined cost and heuristic first.
+
+    queue selects the frontier, see makePriorityFrontier.  Heuristic values
+    can be memoized in a HeuristicCache of cacheSize entries; this is off by
+    default, as A* computes the heuristic of a state again only when it
+    finds a cheaper path to it.
+    """
+    heuristic = cachedHeuristic(heuristic, problem, cacheSize)
+    return bestFirstSearch(problem, makePriorityFrontier(queue), heuristic).path
+
+def greedyBestFirstSearch(problem: SearchProblem, heuristic=nullHeuristic):
+    """
+    Search the node with the lowest heuristic first, ignoring the cost of
+    reaching it.  Usually quick, but the path is not optimal in general.
+    """
+    return bestFirstSearch(problem, PriorityFrontier(), heuristic, costWeight=0).path
+
+
+class ReverseSearchProblem(SearchProblem):
+    """
+    A search problem seen from its goal: the start and goal states swap and
+    successors become predecessors.  The wrapped problem has to provide
+    getGoalState() and getPredecessors(state); the latter returns the same
+    triples as getSuccessors, (predecessor, action, stepCost), where action
+    leads from the predecessor to state.
+
+    Every other attribute (walls, costFn, ...) is looked up on the wrapped
+    problem, and goal is the original start state, so heuristics written
+    against problem.goal estimate the distance back to the start.
+    """
+    def __init__(self, problem):
+        self.problem = problem
+        self.goal = problem.getStartState()
+
+    def getStartState(self):
+        return self.problem.getGoalState()
+
+    def getGoalState(self):
+        return self.goal
+
+    def isGoalState(self, state):
+        return state == self.goal
+
+    def getSuccessors(self, state):
+        return self.problem.getPredecessors(state)
+
+    def getPredecessors(self, state):
+        return self.problem.getSuccessors(state)
+
+    def __getattr__(self, name):
+        return getattr(self.problem, name)
+
+def joinPaths(forward, backward, meet):
+    """
+    Builds the action list of a bidirectional search that met at meet.
+    forward maps a state to (previous state, action, ...) back towards the
+    start, backward maps a state to (next state, action, ...) on towards the
+    goal; the start and the goal map to None.
+    """
+    steps = list()
+    state = meet
+    while (forward[state] != None):
+        state, action = forward[state][:2]
+        steps.append(action)
+    steps.reverse()
+    state = meet
+    while (backward[state] != None):
+        state, action = backward[state][:2]
+        steps.append(action)
+    return steps
+
+def bidirectionalSearch(problem):
+    """
+    Breadth-first search from the start and from the goal at once, for
+    problems with a single known goal state that provide getGoalState() and
+    getPredecessors(state) (see ReverseSearchProblem).  The side with the
+    smaller frontier grows by one whole layer at a time, and the search stops
+    after the first layer that meets the other side, so it returns a path
+    with the fewest actions while expanding roughly the square root of what
+    breadthFirstSearch expands.
+    """
+    global lastResult
+    startTime = time.time()
+    result = SearchResult()
+
+    start, goal = problem.getStartState(), problem.getGoalState()
+    forward = {start: None}  # state -> (previous state, action, depth)
+    backward = {goal: None}  # state -> (next state, action, depth)
+    forward_layer, backward_layer = [start], [goal]
+    forward_depth, backward_depth = 0, 0
+    meet = start if start == goal else None
+
+    while (meet is None and forward_layer and backward_layer):
+        if (len(forward_layer) <= len(backward_layer)):
+            expand, reached, other = problem.getSuccessors, forward, backward
+            layer, depth = forward_layer, forward_depth
+        else:
+            expand, reached, other = problem.getPredecessors, backward, forward
+            layer, depth = backward_layer, backward_depth
+
+        # Expand a whole layer, keeping the shortest connection through it
+        next_layer = list()
+        best = None
+        for state in layer:
+            result.expanded += 1
+            for next_state, action, step_cost in expand(state):
+                if (next_state in reached): continue
+                reached[next_state] = (state, action, depth + 1)
+                next_layer.append(next_state)
+                result.generated += 1
+                if (next_state in other):
+                    other_depth = other[next_state][2] if other[next_state] != None else 0
+                    if (best is None or other_depth < best[0]):
+                        best = (other_depth, next_state)
+        if (best is not None): meet = best[1]
+
+        if (reached is forward):
+            forward_layer, forward_depth = next_layer, depth + 1
+        else:
+            backward_layer, backward_depth = next_layer, depth + 1
+        frontier_size = len(forward_layer) + len(backward_layer)
+        if (frontier_size > result.maxFrontier): result.maxFrontier = frontier_size
+
+    if (meet is not None):
+        result.path = joinPaths(forward, backward, meet)
+        result.cost = problem.getCostOfActions(result.path)
+    result.time = time.time() - startTime
+    lastResult = result
+    return result.path
+
+def bidirectionalAStarSearch(problem: SearchProblem, heuristic=nullHeuristic):
+    """
+    Front-to-end bidirectional A*: one A* search runs forward from the start
+    towards the goal and another backward from the goal towards the start,
+    always advancing the side with the smaller frontier.  Like
+    bidirectionalSearch it needs getGoalState() and getPredecessors(state).
+
+    The heuristic is called as heuristic(state, problem) going forward and as
+    heuristic(state, ReverseSearchProblem(problem)) going backward, so a
+    heuristic that measures the distance to problem.goal (for example
+    manhattanHeuristic) works in both directions.  It has to be consistent
+    in both directions for the returned path to be optimal.
+    """
+    global lastResult
+    startTime = time.time()
+    result = SearchResult()
+
+    reverse = ReverseSearchProblem(problem)
+    start, goal = problem.getStartState(), problem.getGoalState()
+    forward = {start: None}  # state -> (previous state, action)
+    backward = {goal: None}  # state -> (next state, action)
+    forward_cost, backward_cost = {start: 0}, {goal: 0}
+    forward_visited, backward_visited = set(), set()
+    forward_PQ, backward_PQ = util.IndexedPriorityQueue(), util.IndexedPriorityQueue()
+    forward_PQ.push(start, heuristic(start, problem))
+    backward_PQ.push(goal, heuristic(goal, reverse))
+
+    best_cost, meet = (0, start) if start == goal else (float('inf'), None)
+
+    while (not forward_PQ.isEmpty() and not backward_PQ.isEmpty()):
+        # Neither side can improve on the best connection any more
+        if (best_cost <= max(forward_PQ.peekPriority(), backward_PQ.peekPriority())): break
+
+        if (len(forward_PQ) <= len(backward_PQ)):
+            PQ, side_problem, expand = forward_PQ, problem, problem.getSuccessors
+            parent, cost, have_visited, other_cost = forward, forward_cost, forward_visited, backward_cost
+        else:
+            PQ, side_problem, expand = backward_PQ, reverse, problem.getPredecessors
+            parent, cost, have_visited, other_cost = backward, backward_cost, backward_visited, forward_cost
+
+        state = PQ.pop()
+        have_visited.add(state)
+        result.expanded += 1
+        for next_state, action, step_cost in expand(state):
+            if (next_state in have_visited): continue
+            new_cost = cost[state] + step_cost
+            if (next_state in cost and cost[next_state] <= new_cost): continue
+
+            parent[next_state] = (state, action)
+            cost[next_state] = new_cost
+            PQ.update(next_state, new_cost + heuristic(next_state, side_problem))
+            result.generated += 1
+
+            # Connection through next_state to the other side
+            if (next_state in other_cost and new_cost + other_cost[next_state] < best_cost):
+                best_cost, meet = new_cost + other_cost[next_state], next_state
+
+        frontier_size = len(forward_PQ) + len(backward_PQ)
+        if (frontier_size > result.maxFrontier): result.maxFrontier = frontier_size
+
+    if (meet is not None):
+        result.path = joinPaths(forward, backward, meet)
+        result.cost = best_cost
+    result.time = time.time() - startTime
+    lastResult = result
+    return result.path
+
+
+def iterativeDeepeningAStarSearch(problem: SearchProblem, heuristic=nullHeuristic, cacheSize=0):
+    """
+    IDA*: repeated depth-first searches that cut off every path whose cost
+    plus heuristic exceeds a bound, raising the bound to the smallest value
+    that was cut off until a goal is found.  Only the current path is kept in
+    memory, at the price of expanding states again in every iteration.  With
+    an admissible heuristic the returned path is optimal.
+
+    Heuristic values can be memoized as in aStarSearch by passing a
+    cacheSize, so states revisited by later iterations only cost the
+    heuristic once.  This is off by default: the cache would hold states the
+    search itself does not keep.
+    """
+    global lastResult
+    startTime = time.time()
+    result = SearchResult()
+    heuristic = cachedHeuristic(heuristic, problem, cacheSize)
 
     start_state = problem.getStartState()
-    PQ.push((start_state, list()), heuristic(start_state, problem))
+    bound = heuristic(start_state, problem)
+    if (problem.isGoalState(start_state)):
+        result.path, result.cost = list(), 0
 
-    while(not PQ.isEmpty()):
-        state, path = PQ.pop()  # Take current state and path
-        have_visited.add(state)  # Visit the current state
+    while (result.path is None):
+        next_bound = float('inf')  # smallest f value above the bound
+        steps = list()
+        on_path = {start_state}  # states on the current path, to avoid cycles
+        result.expanded += 1
+        stack = [(start_state, 0, iter(problem.getSuccessors(start_state)))]
 
-        # Found goal state
-        if (problem.isGoalState(state)): return path
-
-        successors = problem.getSuccessors(state)
-        for successor in successors:
-
-            # Already have visited the particular node
-            if (successor[0] in have_visited): continue
-            
-            # Search to see if successor already exists in the frontier(PQ)
-            frontier_exists = False
-            for element in PQ.heap:
-                if (successor[0] == element[2][0]):
-                    frontier_exists = True
+        while (stack):
+            state, cost, successors = stack[-1]
+            for next_state, action, step_cost in successors:
+                if (next_state in on_path): continue
+                new_cost = cost + step_cost
+                f = new_cost + heuristic(next_state, problem)
+                if (f > bound):
+                    if (f < next_bound): next_bound = f
+                    continue
+                result.generated += 1
+                steps.append(action)
+
+                # Found goal state
+                if (problem.isGoalState(next_state)):
+                    result.path, result.cost = steps, new_cost
+                    stack = None
                     break
-            
-            heuristic_eval = heuristic(successor[0], problem)  # heuristic cost
 
-            new_path = path + [successor[1]]
-            new_priority = problem.getCostOfActions(new_path)
+                on_path.add(next_state)
+                result.expanded += 1
+                stack.append((next_state, new_cost, iter(problem.getSuccessors(next_state))))
+                if (len(stack) > result.maxFrontier): result.maxFrontier = len(stack)
+                break
+            else:
+                # Every successor has been tried, backtrack
+                stack.pop()
+                on_path.discard(state)
+                if (steps): steps.pop()
+
+        # Solution/Path does not exist
+        if (result.path is None and next_bound == float('inf')): break
+        bound = next_bound
+
+    result.time = time.time() - startTime
+    recordHeuristicStatistics(result, heuristic)
+    lastResult = result
+    return result.path
+
+def recordExpansion(problem, state):
+    "The display bookkeeping of getSuccessors, for searches that expand state without calling it"
+    if hasattr(problem, '_expanded'): problem._expanded += 1
+    visited = getattr(problem, '_visited', None)
+    if (visited is not None and state not in visited):
+        visited[state] = True
+        problem._visitedlist.append(state)
+
+def jumpPointSearch(problem: SearchProblem, heuristic=nullHeuristic):
+    """
+    Jump Point Search for unit-cost 4-connected grids such as
+    PositionSearchProblem.  The problem must have a walls Grid, its states
+    must be (x, y) positions and every move must cost 1.
+
+    Instead of pushing every cell, straight runs that an optimal path would
+    cross without turning are jumped over, and only the cells where a path
+    may have to turn enter the frontier.  Horizontal runs may turn north or
+    south anywhere, so they stop wherever a vertical jump finds something;
+    vertical runs only stop at a cell whose east or west neighbour cannot
+    be reached from the row they came from.  With an admissible heuristic
+    the path is optimal, i.e. as long as the one aStarSearch returns.
+
+    getSuccessors is never called, so every jump point expanded is counted
+    in the problem's _expanded and _visitedlist instead (see
+    recordExpansion), as getSuccessors would have done.
+    """
+    from game import Directions
+    global lastResult
+    startTime = time.time()
+    result = SearchResult()
+
+    walls = problem.walls
+    width, height = walls.width, walls.height
+    isGoal = problem.isGoalState
+    toDirection = {(0, 1): Directions.NORTH, (0, -1): Directions.SOUTH,
+                   (1, 0): Directions.EAST, (-1, 0): Directions.WEST}
+
+    def isOpen(x, y):
+        return 0 <= x < width and 0 <= y < height and not walls[x][y]
+
+    def forced(x, y, dy):
+        "East/west moves out of (x, y) that a run heading dy must not skip"
+        return [(dx, 0) for dx in (-1, 1) if isOpen(x + dx, y) and not isOpen(x + dx, y - dy)]
+
+    def jumpVertical(x, y, dy):
+        while (True):
+            y += dy
+            if (not isOpen(x, y)): return None
+            if (isGoal((x, y)) or forced(x, y, dy)): return (x, y)
+
+    def jumpHorizontal(x, y, dx):
+        while (True):
+            x += dx
+            if (not isOpen(x, y)): return None
+            if (isGoal((x, y))): return (x, y)
+            if (jumpVertical(x, y, 1) is not None or jumpVertical(x, y, -1) is not None): return (x, y)
+
+    start = problem.getStartState()
+    cost = {start: 0}
+    parent = {start: None}
+    arrival = {start: None}  # direction of the jump that reached a point
+    closed = set()
+    frontier = util.IndexedPriorityQueue()
+    frontier.push(start, heuristic(start, problem))
+    goal = None
+
+    while (not frontier.isEmpty()):
+        point = frontier.pop()
+        if (isGoal(point)):
+            goal = point
+            break
+        closed.add(point)
+        result.expanded += 1
+        recordExpansion(problem, point)
+
+        x, y = point
+        heading = arrival[point]
+        if (heading is None):
+            moves = list(toDirection)
+        elif (heading[1] == 0):
+            moves = [heading, (0, 1), (0, -1)]
+        else:
+            moves = [heading] + forced(x, y, heading[1])
+
+        for dx, dy in moves:
+            if (dy == 0):
+                jump = jumpHorizontal(x, y, dx)
+            else:
+                jump = jumpVertical(x, y, dy)
+            if (jump is None or jump in closed): continue
+            new_cost = cost[point] + abs(jump[0] - x) + abs(jump[1] - y)
+            if (jump in cost and cost[jump] <= new_cost): continue
+            cost[jump] = new_cost
+            parent[jump] = point
+            arrival[jump] = (dx, dy)
+            frontier.push(jump, new_cost + heuristic(jump, problem))
+            result.generated += 1
+
+        if (len(frontier) > result.maxFrontier): result.maxFrontier = len(frontier)
+
+    # Unroll every jump into the single steps it stands for
+    if (goal is not None):
+        steps = list()
+        point = goal
+        while (parent[point] is not None):
+            length = abs(point[0] - parent[point][0]) + abs(point[1] - parent[point][1])
+            steps.extend([toDirection[arrival[point]]] * length)
+            point = parent[point]
+        steps.reverse()
+        result.path, result.cost = steps, cost[goal]
+
+    result.time = time.time() - startTime
+    lastResult = result
+    return result.path
+
+def anytimeRepairingAStarSearch(problem: SearchProblem, heuristic=nullHeuristic, weight=3.0, weightStep=0.5,
+                                timeLimit=0.0, deadline=None, cacheSize=HEURISTIC_CACHE_SIZE):
+    """
+    ARA*: a series of weighted A* searches (priority cost + weight *
+    heuristic) with the weight lowered by weightStep after every search
+    until it reaches 1.  The first path comes quickly and costs at most
+    weight times the optimum; each later search starts from the costs found
+    so far and only re-expands the states whose cost has improved since
+    they were expanded, so improving the path is much cheaper than
+    searching again.
+
+    The search stops at the deadline (a time.time() value, or timeLimit
+    seconds after the call) and returns the best path found so far, or None
+    if none was found in time.  search.lastResult.bound tells how far from
+    optimal the returned path may be; with an admissible heuristic it is 1
+    once the search runs to completion, and a search stopped halfway through
+    a pass only keeps the bound the open states prove.
+    """
+    global lastResult
+    startTime = time.time()
+    result = SearchResult()
+    heuristic = cachedHeuristic(heuristic, problem, cacheSize)
+    if (deadline is None and timeLimit): deadline = startTime + timeLimit
+    inf = float('inf')
+
+    start_state = problem.getStartState()
+    cost = {start_state: 0}
+    parent = {start_state: None}  # state -> (previous state, action)
+    goal, goal_cost = None, inf
+    if (problem.isGoalState(start_state)): goal, goal_cost = start_state, 0
+    open_states = {start_state}
+    timed_out = False
+
+    while (True):
+        frontier = util.IndexedPriorityQueue()
+        for state in open_states:
+            frontier.push(state, cost[state] + weight * heuristic(state, problem))
+        closed = set()
+        inconsistent = set()  # states whose cost improved after they were expanded
+
+        # Expand until no open state can lead to a cheaper goal at this weight
+        while (not frontier.isEmpty() and goal_cost > frontier.peekPriority()):
+            if (deadline is not None and time.time() > deadline):
+                timed_out = True
+                break
+            state = frontier.pop()
+            closed.add(state)
+            result.expanded += 1
+            for next_state, action, step_cost in problem.getSuccessors(state):
+                new_cost = cost[state] + step_cost
+                if (next_state in cost and cost[next_state] <= new_cost): continue
+                cost[next_state] = new_cost
+                parent[next_state] = (state, action)
+                result.generated += 1
+                if (new_cost < goal_cost and problem.isGoalState(next_state)):
+                    goal, goal_cost = next_state, new_cost
+                if (next_state in closed):
+                    inconsistent.add(next_state)
+                else:
+                    frontier.push(next_state, new_cost + weight * heuristic(next_state, problem))
+            if (len(frontier) > result.maxFrontier): result.maxFrontier = len(frontier)
+
+        # Publish the best path so far and how close to optimal it is proven to be
+        open_states = set(frontier) | inconsistent
+        if (goal is not None):
+            steps = list()
+            state = goal
+            while (parent[state] is not None):
+                state, action = parent[state]
+                steps.append(action)
+            steps.reverse()
+            result.path, result.cost = steps, goal_cost
+            lower = min([cost[state] + heuristic(state, problem) for state in open_states], default=goal_cost)
+            bound = goal_cost / lower if lower > 0 else inf
+            if (not timed_out): bound = min(bound, weight)  # the weight bounds a finished search only
+            if (result.bound is not None): bound = min(bound, result.bound)
+            result.bound = max(1.0, bound)
+
+        if (timed_out or not open_states or weight <= 1 or result.bound == 1): break
+        weight = max(1.0, weight - weightStep)
+
+    result.time = time.time() - startTime
+    recordHeuristicStatistics(result, heuristic)
+    lastResult = result
+    return result.path
+
+# Default node budget of simplifiedMemoryBoundedAStarSearch
+SMA_MEMORY_LIMIT = 100000
+
+class SMANode:
+    """
+    A node of the tree kept by simplifiedMemoryBoundedAStarSearch.  ownF is
+    the node's own f value and f the backed-up one (the best f below the
+    node, counting the successors that are not in memory).  children holds
+    the successors in memory by state, pending the (state, action, cost)
+    successors that are not (None until the node is first expanded) and
+    forgotten the f values of the pending successors that were dropped to
+    free memory.
+    """
+    __slots__ = ('state', 'parent', 'action', 'stepCost', 'cost', 'depth', 'ownF', 'f', 'children', 'pending',
+                 'forgotten', 'openStamp', 'leafStamp')
+
+    def __init__(self, state, parent, action, stepCost, cost, depth, f):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.stepCost = stepCost
+        self.cost = cost
+        self.depth = depth
+        self.ownF = f
+        self.f = f
+        self.children = dict()
+        self.pending = None
+        self.forgotten = dict()
+        self.openStamp = None  # stamp of the node's live open list entry
+        self.leafStamp = None  # stamp of the node's live droppable leaf entry
+
+    def estimate(self, state):
+        "Lower bound on the f value of the pending successor state"
+        return self.forgotten.get(state, self.ownF)
+
+    def key(self):
+        "Priority of the node on the open list, inf once every successor is in memory"
+        if (self.pending is None): return self.ownF
+        return min([self.estimate(state) for state, _, _ in self.pending], default=float('inf'))
+
+    def path(self):
+        return SearchNode.path(self)
+
+def simplifiedMemoryBoundedAStarSearch(problem: SearchProblem, heuristic=nullHeuristic, memoryLimit=SMA_MEMORY_LIMIT,
+                                       cacheSize=0):
+    """
+    SMA*: A* over a search tree that never holds more than memoryLimit nodes.
+    Every step takes the deepest node of lowest f that still has successors
+    outside memory and generates the most promising one of them.  When memory
+    is full the shallowest leaf with the worst f value is dropped, and its
+    parent remembers that f value so it can regenerate the leaf if it becomes
+    the most promising node again.  A node that would need a successor deeper
+    than the memory allows gets f = inf, and that bound backs up the tree.
+
+    A successor is not generated if its state is already on the path to the
+    node, which rules out cycles; other duplicates are kept, as a cheaper
+    node for the same state may be dropped later.  The search is optimal (for an admissible heuristic) when the
+    optimal path fits in memory, i.e. has at most memoryLimit states;
+    otherwise it returns None once no goal can be reached within the limit.
+    With a cacheSize regenerated successors take their heuristic from a
+    HeuristicCache of that many states, on top of the memoryLimit nodes; it
+    is off by default so that memoryLimit bounds the memory used.
+    """
+    global lastResult
+    startTime = time.time()
+    result = SearchResult()
+    heuristic = cachedHeuristic(heuristic, problem, cacheSize)
+
+    inf = float('inf')
+    stamps = itertools.count()
+    best_heap, worst_heap = list(), list()  # open list, lowest f deepest first / leaves, highest f shallowest first
+
+    def refresh(node):
+        # Requeue node after its successors changed and back its f value up the tree
+        key = node.key()
+        if (key < inf):
+            node.openStamp = next(stamps)
+            heapq.heappush(best_heap, (key, -node.depth, node.openStamp, node))
+        else:
+            node.openStamp = None
+        while (node is not None):
+            f = node.key()
+            for child in node.children.values():
+                if (child.f < f): f = child.f
+            leaf = not node.children and node.parent is not None
+            if (f == node.f and (node.leafStamp is not None or not leaf)): break
+            node.f = f
+            node.leafStamp = None
+            if (leaf):
+                node.leafStamp = next(stamps)
+                heapq.heappush(worst_heap, (-f, node.depth, node.leafStamp, node))
+            node = node.parent
+
+    def drop(node):
+        # Forget a leaf, leaving its f value with the parent
+        parent = node.parent
+        del parent.children[node.state]
+        node.openStamp = node.leafStamp = None
+        parent.pending.append((node.state, node.action, node.stepCost))
+        parent.forgotten[node.state] = node.f
+        refresh(parent)
+
+    start_state = problem.getStartState()
+    root = SMANode(start_state, None, None, 0, 0, 0, heuristic(start_state, problem))
+    refresh(root)
+    used = 1
+
+    while (best_heap):
+        f, _, stamp, node = best_heap[0]
+        if (node.openStamp != stamp):
+            heapq.heappop(best_heap)  # stale entry
+            continue
+        if (f == inf): break  # no goal reachable within the memory limit
+
+        # Found goal state
+        if (problem.isGoalState(node.state)):
+            result.path, result.cost = node.path(), node.cost
+            break
+
+        # Generate the most promising successor that is not in memory
+        if (node.pending is None):
+            node.pending = list(problem.getSuccessors(node.state))
+            result.expanded += 1
+        while (node.pending):
+            successor = min(node.pending, key=lambda successor: node.estimate(successor[0]))
+            node.pending.remove(successor)
+            next_state, action, step_cost = successor
+            estimate = node.forgotten.pop(next_state, node.ownF)
+            new_cost = node.cost + step_cost
+            ancestor = node
+            while (ancestor is not None and ancestor.state != next_state): ancestor = ancestor.parent
+            if (ancestor is not None): continue  # would close a cycle
+            if (node.depth + 2 < memoryLimit or problem.isGoalState(next_state)):
+                f = max(estimate, new_cost + heuristic(next_state, problem))
+            else:
+                f = inf  # its own successors would not fit in memory
+            child = SMANode(next_state, node, action, step_cost, new_cost, node.depth + 1, f)
+            node.children[next_state] = child
+            node.leafStamp = None
+            refresh(child)
+            used += 1
+            result.generated += 1
+            break
+        refresh(node)
+
+        # Free memory by dropping the worst leaves
+        while (used > memoryLimit):
+            _, _, stamp, worst = heapq.heappop(worst_heap)
+            if (worst.leafStamp != stamp): continue
+            drop(worst)
+            used -= 1
+
+        if (used > result.maxFrontier): result.maxFrontier = used
+
+    result.time = time.time() - startTime
+    recordHeuristicStatistics(result, heuristic)
+    lastResult = result
+    return result.path
+
+
+# Strategies raced by portfolioSearch: (name, search function in this module,
+# whether it takes the heuristic, whether its path is optimal)
+PORTFOLIO = [
+    ('astar', 'aStarSearch', True, True),
+    ('ucs', 'uniformCostSearch', False, True),
+    ('greedy', 'greedyBestFirstSearch', True, False),
+    ('bfs', 'breadthFirstSearch', False, False),
+]
+
+# The problem and heuristic of the portfolio, as seen by a worker process
+_portfolioProblem = None
+_portfolioHeuristic = None
+
+def _initPortfolioWorker(problem, heuristic):
+    global _portfolioProblem, _portfolioHeuristic
+    _portfolioProblem, _portfolioHeuristic = problem, heuristic
+
+def _runPortfolioStrategy(strategy):
+    name, function, takesHeuristic, optimal = strategy
+    problem = _portfolioProblem
+    expanded = getattr(problem, '_expanded', 0)
+    try:
+        if takesHeuristic:
+            globals()[function](problem, _portfolioHeuristic)
+        else:
+            globals()[function](problem)
+    except Exception as e:
+        return name, optimal, None, 0, e
+    return name, optimal, lastResult, getattr(problem, '_expanded', 0) - expanded, None
+
+def portfolioSearch(problem: SearchProblem, heuristic=nullHeuristic, requireOptimal=True, maxWorkers=0, strategies=None):
+    """
+    Runs several search strategies on the same problem at once, one per
+    worker process, and returns the path of the first one to finish.  With
+    requireOptimal only strategies marked optimal in PORTFOLIO (or in
+    strategies, a list in the same format) can win and the others only
+    serve as a fallback; otherwise the first path found wins.  The
+    remaining strategies are stopped by terminating the worker pool.
+
+    search.lastResult is the winner's SearchResult, with its name in
+    strategy.  Where possible the workers are forked, so the problem and
+    heuristic need not be picklable; elsewhere they must be.
+    """
+    global lastResult
+    startTime = time.time()
+    if strategies is None:
+        strategies = PORTFOLIO
+    if not maxWorkers:
+        maxWorkers = min(len(strategies), os.cpu_count() or 1)
+
+    pool = util.makeProcessPool(maxWorkers, _initPortfolioWorker, (problem, heuristic))
+    winner, fallback, error = None, None, None
+    try:
+        for name, optimal, result, expanded, e in pool.imap_unordered(_runPortfolioStrategy, strategies):
+            if (e is not None):
+                error = error or e
+                continue
+            if (result.path is None): continue
+            if (optimal or not requireOptimal):
+                winner = (name, result, expanded)
+                break
+            if (fallback is None): fallback = (name, result, expanded)
+    finally:
+        pool.terminate()
+        pool.join()
+
+    if (winner is None): winner = fallback
+    if (winner is None):
+        if (error is not None): raise error
+        result = SearchResult()
+    else:
+        name, result, expanded = winner
+        result.strategy = name
+        if hasattr(problem, '_expanded'): problem._expanded += expanded
+    result.time = time.time() - startTime
+    lastResult = result
+    return result.path
+
+class DStarLite:
+    """
+    Incremental shortest paths on a 4-connected grid with unit step costs
+    (D* Lite, the backward variant of Lifelong Planning A*).
+
+    Distances to the goal (g) and their one-step lookahead values (rhs) are
+    kept between calls.  After walls change (setWall, or updateWalls with a
+    whole Grid) or Pacman moves (moveStart), getPath only re-expands the
+    cells whose distance the change can affect, instead of searching again
+    from scratch.  Changing the goal with setGoal starts over, since every
+    stored distance is measured to the goal.
+
+    walls is a game.Grid; cells holding True (or 1) are walls and every
+    other value, such as the -1 of a cell not yet mapped, counts as open.
+    """
+    def __init__(self, walls, start, goal):
+        self.width, self.height = walls.width, walls.height
+        self.blocked = set()
+        for x in range(self.width):
+            for y in range(self.height):
+                if walls[x][y] == 1: self.blocked.add((x, y))
+        self.start = self.last = start
+        self.setGoal(goal)
+
+    def setGoal(self, goal):
+        "Plans to goal from now on, forgetting all distances."
+        self.goal = goal
+        self.g, self.rhs = dict(), {goal: 0}
+        self.heap, self.keys = list(), dict()  # lazy entries / current key of each queued cell
+        self.counter = itertools.count()
+        self.km = 0
+        self._queue(goal, self._key(goal))
+
+    def moveStart(self, start):
+        "Pacman moved to start; later paths begin there."
+        self.km += self._h(self.last, start)
+        self.last = self.start = start
+
+    def setWall(self, position, isWall=True):
+        "Adds or removes the wall at position."
+        if (isWall == (position in self.blocked)): return
+        if isWall:
+            self.blocked.add(position)
+        else:
+            self.blocked.discard(position)
+        # The edges between position and its neighbours changed cost
+        self._update(position)
+        for neighbor in self._adjacent(position):
+            self._update(neighbor)
+
+    def updateWalls(self, walls):
+        "Applies every difference between a walls Grid and the walls planned with."
+        for x in range(self.width):
+            for y in range(self.height):
+                self.setWall((x, y), walls[x][y] == 1)
+
+    def getPath(self):
+        """
+        Returns the actions of a shortest path from start to goal (None if
+        the goal cannot be reached) and records a SearchResult in
+        search.lastResult, counting only the cells re-expanded by this call.
+        """
+        from game import Directions
+        global lastResult
+        startTime = time.time()
+        result = SearchResult()
+        result.expanded = self._computeShortestPath()
+
+        inf = float('inf')
+        if (self.g.get(self.start, inf) == inf):
+            result.path = None
+        else:
+            moves = {(0, 1): Directions.NORTH, (0, -1): Directions.SOUTH,
+                     (1, 0): Directions.EAST, (-1, 0): Directions.WEST}
+            steps = list()
+            position = self.start
+            while (position != self.goal):
+                step = min(self._neighbors(position), key=lambda cell: self.g.get(cell, inf))
+                steps.append(moves[(step[0] - position[0], step[1] - position[1])])
+                position = step
+            result.path, result.cost = steps, len(steps)
+        result.maxFrontier = len(self.keys)
+        result.time = time.time() - startTime
+        lastResult = result
+        return result.path
+
+    def _h(self, a, b):
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def _neighbors(self, position):
+        "The cells a move from position can reach (none from inside a wall)"
+        if position in self.blocked: return []
+        return self._adjacent(position)
+
+    def _adjacent(self, position):
+        "The open cells north, south, east and west of position"
+        x, y = position
+        cells = list()
+        for cell in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if (0 <= cell[0] < self.width and 0 <= cell[1] < self.height and cell not in self.blocked):
+                cells.append(cell)
+        return cells
+
+    def _key(self, position):
+        inf = float('inf')
+        m = min(self.g.get(position, inf), self.rhs.get(position, inf))
+        return (m + self._h(self.start, position) + self.km, m)
+
+    def _queue(self, position, key):
+        self.keys[position] = key
+        heapq.heappush(self.heap, (key, next(self.counter), position))
+
+    def _topKey(self):
+        # Drop entries of cells that were re-queued or removed since
+        while (self.heap and self.keys.get(self.heap[0][2]) != self.heap[0][0]):
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else (float('inf'), float('inf'))
+
+    def _update(self, position):
+        inf = float('inf')
+        if (position != self.goal):
+            self.rhs[position] = min([1 + self.g.get(cell, inf) for cell in self._neighbors(position)], default=inf)
+        self.keys.pop(position, None)
+        if (self.g.get(position, inf) != self.rhs.get(position, inf)):
+            self._queue(position, self._key(position))
 
-            # State does not exist either in searched state nor in the frontier, insert it
-            if (not frontier_exists):
-                PQ.push((successor[0], new_path), new_priority + heuristic_eval)
-            
-            # Successor exists in the frontier with a higher path cost - update its path cost
-            elif (problem.getCostOfActions(element[2][1]) > new_priority):
-                PQ.update((successor[0], new_path), new_priority + heuristic_eval)
-    
-    # Solution/Path does not exist
-    return None
+    def _computeShortestPath(self):
+        inf = float('inf')
+        expanded = 0
+        while (self._topKey() < self._key(self.start) or
+               self.rhs.get(self.start, inf) != self.g.get(self.start, inf)):
+            old_key, _, position = heapq.heappop(self.heap)
+            del self.keys[position]
+            expanded += 1
+            new_key = self._key(position)
+            if (old_key < new_key):
+                self._queue(position, new_key)  # stale after Pacman moved
+            elif (self.g.get(position, inf) > self.rhs.get(position, inf)):
+                self.g[position] = self.rhs[position]
+                for neighbor in self._neighbors(position):
+                    self._update(neighbor)
+            else:
+                self.g[position] = inf
+                self._update(position)
+                for neighbor in self._neighbors(position):
+                    self._update(neighbor)
+        return expanded
 
 
 # Abbreviations
 bfs = breadthFirstSearch
 dfs = depthFirstSearch
 astar = aStarSearch
-ucs = uniformCostSearch
\ No newline at end of file
+ucs = uniformCostSearch
+bibfs = bidirectionalSearch
+biastar = bidirectionalAStarSearch
+idastar = iterativeDeepeningAStarSearch
+smastar = simplifiedMemoryBoundedAStarSearch
+jps = jumpPointSearch
+greedy = greedyBestFirstSearch
+arastar = anytimeRepairingAStarSearch
+portfolio = portfolioSearch
\ No newline at end of file
@@ -38,8 +38,12 @@ from typing import List, Tuple, Any
 from game import Directions
 from game import Agent
 from game import Actions
+from game import PackedGrid
 import util
 import time
+import os
+import hashlib
+from array import array
 import search
 import pacman
 
@@ -58,6 +62,30 @@ class GoWestAgent(Agent):
 #       after you fill in parts of search.py          #
 #######################################################
 
+def parseBool(value):
+    "Converts 'True' or 'False' from the command line to a bool"
+    if value in ('True', 'False'): return value == 'True'
+    raise ValueError('not a boolean: %s' % value)
+
+def parseSearchOptions(fn, func, options):
+    """
+    Checks that every option given to SearchAgent with -a is an argument of
+    the search function func (named fn), and converts numbers, True and
+    False from strings.  Returns the converted options.
+    """
+    parsed = {}
+    for name, value in options.items():
+        if name not in func.__code__.co_varnames[:func.__code__.co_argcount]:
+            raise AttributeError(name + ' is not an argument of ' + fn + ' in search.py.')
+        parsed[name] = value
+        for convert in (int, float, parseBool):
+            try:
+                parsed[name] = convert(value)
+                break
+            except ValueError:
+                pass
+    return parsed
+
 class SearchAgent(Agent):
     """
     This very general search agent finds a path using a supplied search
@@ -71,20 +99,27 @@ class SearchAgent(Agent):
       depthFirstSearch or dfs
       breadthFirstSearch or bfs
 
+    Any other option is passed on to the search function as a keyword
+    argument (see parseSearchOptions), for example
+      -a fn=smastar,heuristic=manhattanHeuristic,memoryLimit=5000
 
-    Note: You should NOT change any code in SearchAgent
+    Note: You should NOT change any code in SearchAgent; it only forwards
+    those options and prints search.lastResult after the search.
     """
 
-    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic'):
+    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic', **options):
         # Warning: some advanced Python magic is employed below to find the right functions and problems
 
         # Get the search function from the name and heuristic
         if fn not in dir(search):
             raise AttributeError(fn + ' is not a search function in search.py.')
         func = getattr(search, fn)
+        options = parseSearchOptions(fn, func, options)
+        if options:
+            fn += ' (%s)' % ', '.join(['%s=%s' % option for option in options.items()])
         if 'heuristic' not in func.__code__.co_varnames:
             print('[SearchAgent] using function ' + fn)
-            self.searchFunction = func
+            self.searchFunction = lambda x: func(x, **options)
         else:
             if heuristic in globals().keys():
                 heur = globals()[heuristic]
@@ -94,7 +129,7 @@ class SearchAgent(Agent):
                 raise AttributeError(heuristic + ' is not a function in searchAgents.py or search.py.')
             print('[SearchAgent] using function %s and heuristic %s' % (fn, heuristic))
             # Note: this bit of Python trickery combines the search algorithm and the heuristic
-            self.searchFunction = lambda x: func(x, heuristic=heur)
+            self.searchFunction = lambda x: func(x, heuristic=heur, **options)
 
         # Get the search problem type from the name
         if prob not in globals().keys() or not prob.endswith('Problem'):
@@ -114,12 +149,14 @@ class SearchAgent(Agent):
         if self.searchFunction == None: raise Exception("No search function provided for SearchAgent")
         starttime = time.time()
         problem = self.searchType(state) # Makes a new search problem
+        search.lastResult = None
         self.actions  = self.searchFunction(problem) # Find a path
         if self.actions == None:
             self.actions = []
         totalCost = problem.getCostOfActions(self.actions)
         print('Path found with total cost of %d in %.1f seconds' % (totalCost, time.time() - starttime))
         if '_expanded' in dir(problem): print('Search nodes expanded: %d' % problem._expanded)
+        if search.lastResult != None: print('Search statistics: %s' % search.lastResult)
 
     def getAction(self, state):
         """
@@ -157,6 +194,7 @@ class PositionSearchProblem(search.SearchProblem):
         goal: A position in the gameState
         """
         self.walls = gameState.getWalls()
+        self.layout = gameState.data.layout
         self.startState = gameState.getPacmanPosition()
         if start != None: self.startState = start
         self.goal = goal
@@ -196,15 +234,7 @@ class PositionSearchProblem(search.SearchProblem):
          cost of expanding to that successor
         """
 
-        successors = []
-        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x,y = state
-            dx, dy = Actions.directionToVector(action)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextState = (nextx, nexty)
-                cost = self.costFn(nextState)
-                successors.append( ( nextState, action, cost) )
+        successors = [(nextState, action, self.costFn(nextState)) for nextState, action in self.layout.getSuccessors(state)]
 
         # Bookkeeping for display purposes
         self._expanded += 1 # DO NOT CHANGE
@@ -214,6 +244,26 @@ class PositionSearchProblem(search.SearchProblem):
 
         return successors
 
+    def getGoalState(self):
+        return self.goal
+
+    def getPredecessors(self, state):
+        """
+        Returns the states Pacman can reach state from, as (predecessor,
+        action, stepCost) triples where action leads from the predecessor to
+        state.  Used by the bidirectional searches in search.py.
+        """
+        cost = self.costFn(state)
+        predecessors = [(prevState, Actions.reverseDirection(action), cost) for prevState, action in self.layout.getSuccessors(state)]
+
+        # Bookkeeping for display purposes
+        self._expanded += 1
+        if state not in self._visited:
+            self._visited[state] = True
+            self._visitedlist.append(state)
+
+        return predecessors
+
     def getCostOfActions(self, actions):
         """
         Returns the cost of a particular sequence of actions. If those actions
@@ -384,6 +434,7 @@ class FoodSearchProblem:
     def __init__(self, startingGameState: pacman.GameState):
         self.start = (startingGameState.getPacmanPosition(), startingGameState.getFood())
         self.walls = startingGameState.getWalls()
+        self.layout = startingGameState.data.layout
         self.startingGameState = startingGameState
         self._expanded = 0 # DO NOT CHANGE
         self.heuristicInfo = {} # A dictionary for the heuristic to store information
@@ -398,14 +449,10 @@ class FoodSearchProblem:
         "Returns successor states, the actions they require, and a cost of 1."
         successors = []
         self._expanded += 1 # DO NOT CHANGE
-        for direction in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x,y = state[0]
-            dx, dy = Actions.directionToVector(direction)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextFood = state[1].copy()
-                nextFood[nextx][nexty] = False
-                successors.append( ( ((nextx, nexty), nextFood), direction, 1) )
+        for (nextx, nexty), direction in self.layout.getSuccessors(state[0]):
+            nextFood = state[1].copy()
+            nextFood[nextx][nexty] = False
+            successors.append( ( ((nextx, nexty), nextFood), direction, 1) )
         return successors
 
     def getCostOfActions(self, actions):
@@ -422,11 +469,65 @@ class FoodSearchProblem:
             cost += 1
         return cost
 
+class FoodBits(PackedGrid):
+    """
+    A PackedGrid of food positions that is never changed once made, so that
+    search states can share it: eat() returns a new FoodBits without the dot
+    instead of clearing a bit, and copy() returns the FoodBits itself.
+    Everything else (food[x][y], count(), asList(), hashing, equality with
+    other grids) is the PackedGrid's.
+    """
+    def fromGrid(grid):
+        food = FoodBits(grid.width, grid.height)
+        food.bits = (grid if isinstance(grid, PackedGrid) else PackedGrid.fromGrid(grid)).bits
+        return food
+    fromGrid = staticmethod(fromGrid)
+
+    def has(self, x, y):
+        return (self.bits >> (x * self.height + y)) & 1 == 1
+
+    def eat(self, x, y):
+        "Returns the food set without (x,y); self if there is no food there"
+        bit = 1 << (x * self.height + y)
+        if not self.bits & bit:
+            return self
+        food = FoodBits(self.width, self.height)
+        food.bits = self.bits & ~bit
+        return food
+
+    def _set(self, index, value):
+        raise Exception('FoodBits cannot be changed, use eat()')
+
+    def copy(self):
+        return self
+
+class CompactFoodSearchProblem(FoodSearchProblem):
+    """
+    The FoodSearchProblem with the food stored as a FoodBits instead of a
+    Grid, so a state is ( pacmanPosition, FoodBits ).  Successors share
+    unchanged food sets and only allocate a new int when a dot is eaten.
+    """
+    def __init__(self, startingGameState: pacman.GameState):
+        FoodSearchProblem.__init__(self, startingGameState)
+        self.start = (self.start[0], FoodBits.fromGrid(self.start[1]))
+
+    def isGoalState(self, state):
+        return state[1].bits == 0
+
+    def getSuccessors(self, state):
+        "Returns successor states, the actions they require, and a cost of 1."
+        successors = []
+        self._expanded += 1 # DO NOT CHANGE
+        food = state[1]
+        for (nextx, nexty), direction in self.layout.getSuccessors(state[0]):
+            successors.append( ( ((nextx, nexty), food.eat(nextx, nexty)), direction, 1) )
+        return successors
+
 class AStarFoodSearchAgent(SearchAgent):
     "A SearchAgent for FoodSearchProblem using A* and your foodHeuristic"
     def __init__(self):
         self.searchFunction = lambda prob: search.aStarSearch(prob, foodHeuristic)
-        self.searchType = FoodSearchProblem
+        self.searchType = CompactFoodSearchProblem
 
 def foodHeuristic(state: Tuple[Tuple, List[List]], problem: FoodSearchProblem):
     """
@@ -460,6 +561,101 @@ def foodHeuristic(state: Tuple[Tuple, List[List]], problem: FoodSearchProblem):
     "*** YOUR CODE HERE ***"
     return 0
 
+# Admissible and consistent heuristics for the FoodSearchProblem (and
+# CompactFoodSearchProblem), all measured in maze distance.  They share a
+# MazeDistanceOracle and some per food set tables, kept in
+# problem.heuristicInfo.  Every dot must be reachable from Pacman.
+
+# Food sets whose tables are remembered: dot lists and spanning tree weights,
+# and the lists of all pairs of dots, which take O(dots^2) each
+FOOD_CACHE_SIZE = 10000
+FOOD_PAIRS_CACHE_SIZE = 500
+
+def foodHeuristicInfo(problem):
+    info = problem.heuristicInfo
+    if 'oracle' not in info:
+        oracle = MazeDistanceOracle.forLayout(problem.startingGameState.data.layout)
+        info['oracle'] = oracle
+        # Least recently used food -> table caches
+        info['dots'] = search.HeuristicCache(lambda food, problem: food.asList(), None, FOOD_CACHE_SIZE)
+        info['mst'] = search.HeuristicCache(lambda food, problem: foodMSTWeight(foodDots(food, info), oracle.getDistance),
+                                            None, FOOD_CACHE_SIZE)
+        info['pairs'] = search.HeuristicCache(lambda food, problem: foodPairs(foodDots(food, info), oracle.getDistance),
+                                              None, FOOD_PAIRS_CACHE_SIZE)
+    return info
+
+def foodDots(food, info):
+    return info['dots'](food)
+
+def foodMSTWeight(dots, distance):
+    "Weight of a minimum spanning tree of the dots, by Prim's algorithm on their complete graph"
+    weight = 0
+    closest = {dot: distance(dots[0], dot) for dot in dots[1:]}
+    while closest:
+        dot = min(closest, key=closest.get)
+        weight += closest.pop(dot)
+        for other in closest:
+            d = distance(dot, other)
+            if d < closest[other]:
+                closest[other] = d
+    return weight
+
+def foodPairs(dots, distance):
+    "(distance, dot, dot) for every pair of dots, farthest first"
+    pairs = [(distance(a, b), a, b) for i, a in enumerate(dots) for b in dots[i + 1:]]
+    pairs.sort(reverse=True)
+    return pairs
+
+def maxFoodDistanceHeuristic(state, problem):
+    """
+    The maze distance to the farthest dot: that dot has to be reached at
+    some point, and every move changes the distance by at most one.
+    """
+    position, food = state
+    info = foodHeuristicInfo(problem)
+    distance = info['oracle'].getDistance
+    return max([distance(position, dot) for dot in foodDots(food, info)], default=0)
+
+def foodMSTHeuristic(state, problem):
+    """
+    The weight of a minimum spanning tree of the dots (in maze distance) plus
+    the distance from Pacman to the closest dot.  Any route through every dot
+    starts by reaching some dot and then contains a path through the rest,
+    which weighs at least as much as the spanning tree.  The tree only depends
+    on the food, so its weight is cached per food set.
+    """
+    position, food = state
+    info = foodHeuristicInfo(problem)
+    distance = info['oracle'].getDistance
+    dots = foodDots(food, info)
+    if not dots:
+        return 0
+
+    return info['mst'](food) + min(distance(position, dot) for dot in dots)
+
+def farthestPairHeuristic(state, problem):
+    """
+    For any two dots a and b, Pacman has to reach one of them and then walk
+    to the other, which takes at least min(d(pacman, a), d(pacman, b)) +
+    d(a, b).  Returns the largest such bound over all pairs of dots.
+    """
+    position, food = state
+    info = foodHeuristicInfo(problem)
+    distance = info['oracle'].getDistance
+    dots = foodDots(food, info)
+    if len(dots) < 2:
+        return maxFoodDistanceHeuristic(state, problem)
+
+    pairs = info['pairs'](food)
+    fromPacman = {dot: distance(position, dot) for dot in dots}
+    farthest = max(fromPacman.values())
+    best = 0
+    for d, a, b in pairs:
+        if d + farthest <= best:
+            break  # no remaining pair can do better
+        best = max(best, d + min(fromPacman[a], fromPacman[b]))
+    return best
+
 class ClosestDotSearchAgent(SearchAgent):
     "Search for all food using a sequence of searches"
     def registerInitialState(self, state):
@@ -491,6 +687,101 @@ class ClosestDotSearchAgent(SearchAgent):
         "*** YOUR CODE HERE ***"
         util.raiseNotDefined()
 
+class ClosestDotPlanner:
+    """
+    Plans the greedy tour of ClosestDotSearchAgent: repeatedly walk to the
+    closest remaining dot until none is left.
+
+    Only Pacman's cell and the remaining food are tracked, as an open cell
+    index and an int with one bit per open cell, instead of full game
+    states.  Each leg is one breadth first search from Pacman that stops at
+    the first cell whose food bit is set.  The search arrays (the epoch that
+    last reached each cell and its parent) belong to the planner and are
+    reused by every leg: bumping the epoch clears them without touching the
+    cells.  Successors are visited in the PositionSearchProblem order, so
+    the legs are the ones breadthFirstSearch finds on AnyFoodSearchProblem.
+    """
+    def __init__(self, layout):
+        cells, index, _, successors = layout.getSuccessorTable()
+        self.cells = cells
+        self.index = index
+        self.successors = [tuple((index[cell], action) for cell, action in moves) for moves in successors]
+        self.reached = array('i', [0]) * len(cells)  # epoch of the last search that reached each cell
+        self.parent = array('i', [0]) * len(cells)
+        self.action = [None] * len(cells)
+        self.epoch = 0
+
+    def foodBits(self, food):
+        "Returns the food Grid as a bitmask over the open cells."
+        bits = 0
+        for cell in food.asList():
+            bits |= 1 << self.index[cell]
+        return bits
+
+    def closestDot(self, source, food):
+        """
+        Returns the open cell index of the dot closest to cell index source
+        and the actions reaching it, or (None, None) if no dot is reachable.
+        """
+        self.epoch += 1
+        epoch, reached, parent, action = self.epoch, self.reached, self.parent, self.action
+        reached[source] = epoch
+        layer = [source]
+        target = None
+        while (layer and target is None):
+            nextLayer = []
+            for i in layer:
+                for j, move in self.successors[i]:
+                    if (reached[j] == epoch): continue
+                    reached[j] = epoch
+                    parent[j] = i
+                    action[j] = move
+                    if (food >> j & 1):
+                        target = j
+                        break
+                    nextLayer.append(j)
+                if (target is not None): break
+            layer = nextLayer
+        if (target is None): return None, None
+
+        steps = list()
+        i = target
+        while (i != source):
+            steps.append(action[i])
+            i = parent[i]
+        steps.reverse()
+        return target, steps
+
+    def plan(self, start, food):
+        """
+        Returns the actions of the whole tour from position start, eating
+        every dot of the food Grid.
+        """
+        actions = list()
+        position = self.index[start]
+        bits = self.foodBits(food) & ~(1 << position)
+        while (bits):
+            target, steps = self.closestDot(position, bits)
+            if (target is None):
+                raise Exception('No path to the remaining food from %s' % str(self.cells[position]))
+            actions += steps
+            position = target
+            bits &= ~(1 << target)
+        return actions
+
+class ClosestDotPlannerAgent(SearchAgent):
+    """
+    Eats the food in the same order as ClosestDotSearchAgent, but plans the
+    whole tour with a ClosestDotPlanner instead of one search problem and a
+    walk over full game states per dot.
+    """
+    def registerInitialState(self, state):
+        starttime = time.time()
+        planner = ClosestDotPlanner(state.data.layout)
+        self.actions = planner.plan(state.getPacmanPosition(), state.getFood())
+        self.actionIndex = 0
+        print('Path found with cost %d in %.3f seconds.' % (len(self.actions), time.time() - starttime))
+
 class AnyFoodSearchProblem(PositionSearchProblem):
     """
     A search problem for finding a path to any food.
@@ -513,6 +804,7 @@ class AnyFoodSearchProblem(PositionSearchProblem):
 
         # Store info for the PositionSearchProblem (no need to change this)
         self.walls = gameState.getWalls()
+        self.layout = gameState.data.layout
         self.startState = gameState.getPacmanPosition()
         self.costFn = lambda x: 1
         self._visited, self._visitedlist, self._expanded = {}, [], 0 # DO NOT CHANGE
@@ -542,5 +834,195 @@ def mazeDistance(point1: Tuple[int, int], point2: Tuple[int, int], gameState: pa
     walls = gameState.getWalls()
     assert not walls[x1][y1], 'point1 is a wall: ' + str(point1)
     assert not walls[x2][y2], 'point2 is a wall: ' + str(point2)
-    prob = PositionSearchProblem(gameState, start=point1, goal=point2, warn=False, visualize=False)
-    return len(search.bfs(prob))
+    return MazeDistanceOracle.forLayout(gameState.data.layout).getDistance(point1, point2)
+
+DISTANCE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'distanceCache')
+
+class MazeDistanceOracle:
+    """
+    All-pairs maze distances for a single layout.
+
+    A breadth first search is run from every open cell once and the results
+    are kept in a flat int16 matrix (cells x cells), so every later query is
+    a single index lookup. By default the matrix is only kept in memory; given
+    a cacheDir (DISTANCE_CACHE_DIR, say) it is written there, keyed by a hash
+    of the layout's walls, and read back the next time the same maze is used.
+    """
+    _instances = {}
+
+    def __init__(self, layout, cacheDir=None):
+        walls = layout.walls
+        self.walls = walls
+        self.cells = [(x, y) for x in range(walls.width) for y in range(walls.height) if not walls[x][y]]
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+        self.key = MazeDistanceOracle.layoutKey(layout)
+        self.distances = None
+        if cacheDir is not None:
+            self.distances = self._load(cacheDir)
+        if self.distances is None:
+            self.distances = self._compute()
+            if cacheDir is not None:
+                self._save(cacheDir)
+
+    @staticmethod
+    def layoutKey(layout):
+        "Only walls affect distances, so food, capsules and agents are blanked out."
+        text = '\n'.join(''.join('%' if c == '%' else ' ' for c in row) for row in layout.layoutText)
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    @classmethod
+    def forLayout(cls, layout, cacheDir=None):
+        """
+        Returns the oracle for this maze, building it at most once per
+        process.  cacheDir only matters for the call that builds it, so the
+        food heuristics and mazeDistance use the disk cache only if the oracle
+        was first requested with one.
+        """
+        key = cls.layoutKey(layout)
+        if key not in cls._instances:
+            cls._instances[key] = cls(layout, cacheDir)
+        return cls._instances[key]
+
+    def getDistance(self, pos1, pos2):
+        """
+        Returns the maze distance between two open cells, or None if pos2
+        cannot be reached from pos1.
+        """
+        d = self.distances[self.index[pos1] * len(self.cells) + self.index[pos2]]
+        return None if d < 0 else d
+
+    def distancesFrom(self, pos):
+        "Returns a dict mapping every reachable cell to its distance from pos."
+        n = len(self.cells)
+        row = self.distances[self.index[pos] * n:(self.index[pos] + 1) * n]
+        return {cell: d for cell, d in zip(self.cells, row) if d >= 0}
+
+    def _compute(self):
+        n = len(self.cells)
+        neighbors = []
+        for x, y in self.cells:
+            adjacent = []
+            for cell in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+                if cell in self.index:
+                    adjacent.append(self.index[cell])
+            neighbors.append(adjacent)
+
+        distances = array('h', [-1]) * (n * n)
+        for source in range(n):
+            base = source * n
+            distances[base + source] = 0
+            layer, depth = [source], 0
+            while layer:
+                depth += 1
+                nextLayer = []
+                for i in layer:
+                    for j in neighbors[i]:
+                        if distances[base + j] < 0:
+                            distances[base + j] = depth
+                            nextLayer.append(j)
+                layer = nextLayer
+        return distances
+
+    def _cachePath(self, cacheDir):
+        return os.path.join(cacheDir, self.key + '.dist')
+
+    def _load(self, cacheDir):
+        path = self._cachePath(cacheDir)
+        if not os.path.exists(path):
+            return None
+        distances = array('h')
+        try:
+            with open(path, 'rb') as f:
+                distances.frombytes(f.read())
+        except (OSError, ValueError):
+            return None
+        if len(distances) != len(self.cells) ** 2:
+            return None
+        return distances
+
+    def _save(self, cacheDir):
+        try:
+            os.makedirs(cacheDir, exist_ok=True)
+            with open(self._cachePath(cacheDir), 'wb') as f:
+                self.distances.tofile(f)
+        except OSError:
+            pass
+
+def searchFromSource(layout, source, goals):
+    """
+    Returns (source, goal, actions) for every goal, with the shortest paths
+    taken from a single breadth first search tree rooted at source.  The
+    search stops as soon as every goal has been reached, and actions is
+    None for a goal that cannot be reached.  Successors are expanded in the
+    PositionSearchProblem order, so each path is the one breadthFirstSearch
+    returns for that start and goal.
+    """
+    _, index, _, successors = layout.getSuccessorTable()
+    parent = {source: None}
+    remaining = set(goals) - {source}
+    layer = [source]
+    while (layer and remaining):
+        nextLayer = []
+        for position in layer:
+            for nextPosition, action in successors[index[position]]:
+                if (nextPosition in parent): continue
+                parent[nextPosition] = (position, action)
+                remaining.discard(nextPosition)
+                nextLayer.append(nextPosition)
+        layer = nextLayer
+
+    results = []
+    for goal in goals:
+        if goal not in parent:
+            results.append((source, goal, None))
+            continue
+        steps = []
+        position = goal
+        while parent[position] is not None:
+            position, action = parent[position]
+            steps.append(action)
+        steps.reverse()
+        results.append((source, goal, steps))
+    return results
+
+# The layout of the running batchMazeSearch, as seen by a worker process
+_batchLayout = None
+
+def _initBatchWorker(layout):
+    global _batchLayout
+    _batchLayout = layout
+
+def _runBatchSource(query):
+    source, goals = query
+    return searchFromSource(_batchLayout, source, goals)
+
+def batchMazeSearch(layout, queries, maxWorkers=0):
+    """
+    Answers many shortest path queries on one layout, given as (start, goal)
+    position pairs.  Queries with the same start share one breadth first
+    search tree (see searchFromSource), and the distinct starts are spread
+    over maxWorkers worker processes (by default one per core; 1 searches
+    in this process).
+
+    This is a generator of (start, goal, actions) triples, yielded as soon
+    as the tree of their start is done, so the order follows the workers
+    and not the queries.
+    """
+    bySource = {}
+    for start, goal in queries:
+        bySource.setdefault(start, []).append(goal)
+    if not maxWorkers:
+        maxWorkers = min(len(bySource), os.cpu_count() or 1)
+
+    if maxWorkers <= 1:
+        for source, goals in bySource.items():
+            yield from searchFromSource(layout, source, goals)
+        return
+
+    pool = util.makeProcessPool(maxWorkers, _initBatchWorker, (layout,))
+    try:
+        for results in pool.imap_unordered(_runBatchSource, bySource.items()):
+            yield from results
+    finally:
+        pool.terminate()
+        pool.join()
@@ -368,6 +368,964 @@ class PacmanSearchTest(testClasses.TestCase):
         return True
 
 
+class ExpansionLimitExceeded(Exception):
+    pass
+
+class MemoryBoundedSearchTest(testClasses.TestCase):
+    """
+    Runs a memory-bounded search (search.smastar by default) with the given
+    memoryLimit and checks the cost of the path it returns, or that it
+    returns None when the optimal path does not fit in memory.  The search
+    fails the test if it calls getSuccessors more than maxExpanded times,
+    which catches a search that keeps regenerating the same nodes.  The
+    optional costFn and goal are passed on to the search problem.
+    """
+
+    def __init__(self, question, testDict):
+        super(MemoryBoundedSearchTest, self).__init__(question, testDict)
+        self.layout_text = testDict['layout']
+        self.alg = testDict.get('algorithm', 'simplifiedMemoryBoundedAStarSearch')
+        self.layoutName = testDict['layoutName']
+        self.searchProblemClassName = testDict.get('searchProblemClass', 'PositionSearchProblem')
+        self.heuristicName = testDict.get('heuristic', None)
+        self.costFn = eval(testDict.get('costFn', 'None'))
+        self.goal = eval(testDict.get('goal', 'None'))
+        self.memoryLimit = int(testDict['memoryLimit'])
+        self.maxExpanded = int(testDict['maxExpanded'])
+
+    def getSolInfo(self, search, searchAgents):
+        alg = getattr(search, self.alg)
+        lay = layout.Layout([l.strip() for l in self.layout_text.split('\n')])
+        start_state = pacman.GameState()
+        start_state.initialize(lay, 0)
+        problemOptions = {}
+        if self.costFn != None:
+            problemOptions['costFn'] = self.costFn
+        if self.goal != None:
+            problemOptions['goal'] = self.goal
+        problem = getattr(searchAgents, self.searchProblemClassName)(start_state, **problemOptions)
+        heuristic = getattr(searchAgents, self.heuristicName) if self.heuristicName != None else search.nullHeuristic
+
+        calls = [0]
+        getSuccessors = problem.getSuccessors
+        def limitedGetSuccessors(state):
+            calls[0] += 1
+            if calls[0] > self.maxExpanded:
+                raise ExpansionLimitExceeded()
+            return getSuccessors(state)
+        problem.getSuccessors = limitedGetSuccessors
+
+        try:
+            solution = alg(problem, heuristic, memoryLimit=self.memoryLimit)
+        except ExpansionLimitExceeded:
+            return None, 'The search did not finish within %s expansions' % self.maxExpanded
+        if solution is None:
+            return 'None', None
+        if not checkSolution(problem, solution):
+            return None, 'The path returned by %s does not reach a goal' % self.alg
+        return str(problem.getCostOfActions(solution)), None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        search = moduleDict['search']
+        searchAgents = moduleDict['searchAgents']
+        gold_cost = solutionDict['solution_cost']
+
+        cost, error = self.getSolInfo(search, searchAgents)
+        if error != None:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('%s' % error)
+            return False
+
+        if cost != gold_cost:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('\tmemory limit:\t\t%s' % self.memoryLimit)
+            grades.addMessage('\tstudent solution cost:\t%s' % cost)
+            grades.addMessage('\tcorrect solution cost:\t%s' % gold_cost)
+            return False
+
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
+        grades.addMessage('\tmemory limit:\t\t%s' % self.memoryLimit)
+        grades.addMessage('\tsolution cost:\t\t%s' % cost)
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        search = moduleDict['search']
+        searchAgents = moduleDict['searchAgents']
+        cost, error = self.getSolInfo(search, searchAgents)
+        if error != None: raise Exception("Error in solution code: %s" % error)
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# "None" means no path fits in the memory limit.\n')
+        handle.write('solution_cost: "%s"\n' % cost)
+        handle.close()
+        return True
+
+
+class PriorityQueueTest(testClasses.TestCase):
+    """
+    Runs a script of operations on one of the priority queues in util.py
+    and checks every result.  queue names the class and lazy, if given, is
+    passed to its constructor.  Each line of operations is one of
+
+      push item priority [tie]      update item priority [tie]
+      pop item                      priority item value
+      len n                         peek value
+      error push item priority      (the push must raise a ValueError)
+
+    where pop, priority, len and peek give the expected result.
+    """
+
+    def __init__(self, question, testDict):
+        super(PriorityQueueTest, self).__init__(question, testDict)
+        self.queueName = testDict['queue']
+        self.lazy = testDict.get('lazy', None)
+        self.operations = [line.split() for line in testDict['operations'].split('\n') if line.strip()]
+
+    def parseNumber(self, text):
+        try:
+            return int(text)
+        except ValueError:
+            return float(text)
+
+    def run(self):
+        import util
+        queueClass = getattr(util, self.queueName)
+        if self.lazy != None:
+            queue = queueClass(lazy=self.lazy.lower() == 'true')
+        else:
+            queue = queueClass()
+
+        for operation in self.operations:
+            command, args = operation[0], operation[1:]
+            line = ' '.join(operation)
+            if command == 'error':
+                try:
+                    getattr(queue, args[0])(args[1], *[self.parseNumber(a) for a in args[2:]])
+                except ValueError:
+                    continue
+                return '%s did not raise a ValueError' % line
+            if command in ('push', 'update'):
+                getattr(queue, command)(args[0], *[self.parseNumber(a) for a in args[1:]])
+                continue
+            if command == 'pop':
+                found = queue.pop()
+            elif command == 'priority':
+                found = queue.getPriority(args[0])
+            elif command == 'len':
+                found = len(queue)
+            elif command == 'peek':
+                found = queue.peekPriority()
+            else:
+                raise Exception('Unknown queue operation: %s' % line)
+            expected = args[-1] if command in ('pop', 'priority') else args[0]
+            if str(found) != expected:
+                return '%s: got %s' % (line, found)
+        return None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        error = self.run()
+        if error != None:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('%s' % error)
+            return False
+        grades.addMessage('PASS: %s' % self.path)
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# The expected results are part of the test.\n')
+        handle.close()
+        return True
+
+
+class SearchCostTest(testClasses.TestCase):
+    """
+    Runs a search that returns an optimal path of its own (search.jps, say)
+    and checks that the path reaches the goal at the cost of the path of
+    referenceAlgorithm (uniformCostSearch by default), and that the problem
+    counted at least one expanded node.  The optional costFn is passed on to
+    the search problem of both searches.
+    """
+
+    def __init__(self, question, testDict):
+        super(SearchCostTest, self).__init__(question, testDict)
+        self.layout_text = testDict['layout']
+        self.alg = testDict['algorithm']
+        self.referenceAlg = testDict.get('referenceAlgorithm', 'uniformCostSearch')
+        self.layoutName = testDict['layoutName']
+        self.searchProblemClassName = testDict.get('searchProblemClass', 'PositionSearchProblem')
+        self.heuristicName = testDict.get('heuristic', None)
+        self.costFn = eval(testDict.get('costFn', 'None'))
+
+    def getSolInfo(self, search, searchAgents, algName, heuristicName):
+        alg = getattr(search, algName)
+        lay = layout.Layout([l.strip() for l in self.layout_text.split('\n')])
+        start_state = pacman.GameState()
+        start_state.initialize(lay, 0)
+        problemOptions = {}
+        if self.costFn != None:
+            problemOptions['costFn'] = self.costFn
+        problem = getattr(searchAgents, self.searchProblemClassName)(start_state, **problemOptions)
+        heuristic = getattr(searchAgents, heuristicName) if heuristicName != None else None
+
+        if heuristic != None:
+            solution = alg(problem, heuristic)
+        else:
+            solution = alg(problem)
+        if type(solution) != type([]):
+            return None, None, 'The result of %s must be a list. (Instead, it is %s)' % (algName, type(solution))
+        expanded = problem._expanded
+        if not checkSolution(problem, solution):
+            return None, None, 'The path returned by %s does not reach a goal' % algName
+        return problem.getCostOfActions(solution), expanded, None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        search = moduleDict['search']
+        searchAgents = moduleDict['searchAgents']
+        gold_cost = int(solutionDict['solution_cost'])
+
+        cost, expanded, error = self.getSolInfo(search, searchAgents, self.alg, self.heuristicName)
+        if error != None:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('%s' % error)
+            return False
+
+        if cost != gold_cost:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('\tstudent solution cost:\t%s' % cost)
+            grades.addMessage('\tcorrect solution cost:\t%s' % gold_cost)
+            return False
+
+        if expanded == 0:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('The problem did not count any expanded nodes')
+            return False
+
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
+        grades.addMessage('\tsolution cost:\t\t%s' % cost)
+        grades.addMessage('\tnodes expanded:\t\t%s' % expanded)
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        search = moduleDict['search']
+        searchAgents = moduleDict['searchAgents']
+        cost, _, error = self.getSolInfo(search, searchAgents, self.referenceAlg, None)
+        if error != None: raise Exception("Error in solution code: %s" % error)
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# The cost is that of the path %s returns.\n' % self.referenceAlg)
+        handle.write('solution_cost: "%s"\n' % cost)
+        handle.close()
+        return True
+
+
+class ExpansionClock:
+    "Stands in for the time module: the time is the number of getSuccessors calls so far"
+
+    def __init__(self):
+        self.calls = 0
+
+    def time(self):
+        return self.calls
+
+
+class AnytimeSearchTest(testClasses.TestCase):
+    """
+    Runs an anytime search (search.arastar by default) against a clock that
+    ticks once per getSuccessors call, stopping it after each of the given
+    numbers of expansions and once more without a deadline.  Every path it
+    returns must reach a goal within search.lastResult.bound times the
+    optimal cost, and the search without a deadline must return an optimal
+    path with a bound of 1.
+    """
+
+    def __init__(self, question, testDict):
+        super(AnytimeSearchTest, self).__init__(question, testDict)
+        self.layout_text = testDict['layout']
+        self.alg = testDict.get('algorithm', 'anytimeRepairingAStarSearch')
+        self.layoutName = testDict['layoutName']
+        self.searchProblemClassName = testDict.get('searchProblemClass', 'PositionSearchProblem')
+        self.heuristicName = testDict.get('heuristic', None)
+        self.timeLimits = [int(limit) for limit in testDict['timeLimits'].split()]
+
+    def getSolInfo(self, search, searchAgents, timeLimit):
+        alg = getattr(search, self.alg)
+        lay = layout.Layout([l.strip() for l in self.layout_text.split('\n')])
+        start_state = pacman.GameState()
+        start_state.initialize(lay, 0)
+        problem = getattr(searchAgents, self.searchProblemClassName)(start_state)
+        heuristic = getattr(searchAgents, self.heuristicName) if self.heuristicName != None else search.nullHeuristic
+
+        clock = ExpansionClock()
+        getSuccessors = problem.getSuccessors
+        def tickingGetSuccessors(state):
+            clock.calls += 1
+            return getSuccessors(state)
+        problem.getSuccessors = tickingGetSuccessors
+
+        realTime = search.time
+        search.time = clock
+        try:
+            solution = alg(problem, heuristic, timeLimit=timeLimit)
+        finally:
+            search.time = realTime
+        if solution is None:
+            return None, None, None
+        if not checkSolution(problem, solution):
+            return None, None, 'The path returned by %s does not reach a goal' % self.alg
+        return problem.getCostOfActions(solution), search.lastResult.bound, None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        search = moduleDict['search']
+        searchAgents = moduleDict['searchAgents']
+        gold_cost = int(solutionDict['solution_cost'])
+
+        for timeLimit in self.timeLimits + [0]:
+            cost, bound, error = self.getSolInfo(search, searchAgents, timeLimit)
+            if error != None:
+                grades.addMessage('FAIL: %s' % self.path)
+                grades.addMessage('%s' % error)
+                return False
+            if cost is None and timeLimit == 0:
+                grades.addMessage('FAIL: %s' % self.path)
+                grades.addMessage('%s found no path without a deadline' % self.alg)
+                return False
+            if cost is None:
+                continue
+            if bound is None or cost > bound * gold_cost + 1e-9:
+                grades.addMessage('FAIL: %s' % self.path)
+                grades.addMessage('\tstopped after:\t\t%s expansions' % timeLimit)
+                grades.addMessage('\tstudent solution cost:\t%s' % cost)
+                grades.addMessage('\tstudent bound:\t\t%s' % bound)
+                grades.addMessage('\tcorrect solution cost:\t%s' % gold_cost)
+                return False
+
+        if cost != gold_cost or bound != 1:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('Without a deadline %s returned cost %s with bound %s' % (self.alg, cost, bound))
+            grades.addMessage('\tcorrect solution cost:\t%s' % gold_cost)
+            return False
+
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
+        grades.addMessage('\tsolution cost:\t\t%s' % cost)
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        search = moduleDict['search']
+        searchAgents = moduleDict['searchAgents']
+        lay = layout.Layout([l.strip() for l in self.layout_text.split('\n')])
+        start_state = pacman.GameState()
+        start_state.initialize(lay, 0)
+        problem = getattr(searchAgents, self.searchProblemClassName)(start_state)
+        solution = search.uniformCostSearch(problem)
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# The cost is that of the path uniformCostSearch returns.\n')
+        handle.write('solution_cost: "%s"\n' % problem.getCostOfActions(solution))
+        handle.close()
+        return True
+
+
+class PortfolioSearchTest(testClasses.TestCase):
+    """
+    Runs search.portfolioSearch with the named strategies of search.PORTFOLIO,
+    in the given order, on a single worker so that they finish in that order.
+    Checks the cost of the returned path and which strategy won, which with
+    requireOptimal has to be the first optimal one.
+    """
+
+    def __init__(self, question, testDict):
+        super(PortfolioSearchTest, self).__init__(question, testDict)
+        self.layout_text = testDict['layout']
+        self.layoutName = testDict['layoutName']
+        self.heuristicName = testDict.get('heuristic', None)
+        self.costFn = eval(testDict.get('costFn', 'None'))
+        self.strategyNames = testDict['strategies'].split()
+        self.requireOptimal = testDict['requireOptimal'] == 'True'
+
+    def getSolInfo(self, search, searchAgents):
+        lay = layout.Layout([l.strip() for l in self.layout_text.split('\n')])
+        start_state = pacman.GameState()
+        start_state.initialize(lay, 0)
+        problemOptions = {}
+        if self.costFn != None:
+            problemOptions['costFn'] = self.costFn
+        problem = searchAgents.PositionSearchProblem(start_state, warn=False, visualize=False, **problemOptions)
+        heuristic = getattr(searchAgents, self.heuristicName) if self.heuristicName != None else search.nullHeuristic
+        portfolio = dict((strategy[0], strategy) for strategy in search.PORTFOLIO)
+        strategies = [portfolio[name] for name in self.strategyNames]
+
+        solution = search.portfolioSearch(problem, heuristic, requireOptimal=self.requireOptimal, maxWorkers=1,
+                                          strategies=strategies)
+        if type(solution) != type([]):
+            return None, None, 'The result of portfolioSearch must be a list. (Instead, it is %s)' % type(solution)
+        if not checkSolution(problem, solution):
+            return None, None, 'The path returned by portfolioSearch does not reach a goal'
+        return problem.getCostOfActions(solution), search.lastResult.strategy, None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        search = moduleDict['search']
+        searchAgents = moduleDict['searchAgents']
+        gold_cost = int(solutionDict['solution_cost'])
+        gold_strategy = solutionDict['strategy']
+
+        cost, strategy, error = self.getSolInfo(search, searchAgents)
+        if error != None:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('%s' % error)
+            return False
+
+        if cost != gold_cost or strategy != gold_strategy:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('\tstudent solution cost:\t%s (found by %s)' % (cost, strategy))
+            grades.addMessage('\tcorrect solution cost:\t%s (found by %s)' % (gold_cost, gold_strategy))
+            return False
+
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
+        grades.addMessage('\tsolution cost:\t\t%s' % cost)
+        grades.addMessage('\tfound by:\t\t%s' % strategy)
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        cost, strategy, error = self.getSolInfo(moduleDict['search'], moduleDict['searchAgents'])
+        if error != None: raise Exception("Error in solution code: %s" % error)
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('solution_cost: "%s"\n' % cost)
+        handle.write('strategy: "%s"\n' % strategy)
+        handle.close()
+        return True
+
+
+class BatchSearchTest(testClasses.TestCase):
+    """
+    Runs searchAgents.batchMazeSearch on the queries (one "startX startY
+    goalX goalY" per line) with maxWorkers worker processes and checks that
+    it answers each query once, with the actions breadthFirstSearch returns
+    on the PositionSearchProblem from that start to that goal.
+    """
+
+    def __init__(self, question, testDict):
+        super(BatchSearchTest, self).__init__(question, testDict)
+        self.layout_text = testDict['layout']
+        self.layoutName = testDict['layoutName']
+        self.queries = []
+        for line in testDict['queries'].split('\n'):
+            if line.strip():
+                x1, y1, x2, y2 = [int(n) for n in line.split()]
+                self.queries.append(((x1, y1), (x2, y2)))
+        self.maxWorkers = int(testDict['maxWorkers'])
+
+    def getSolInfo(self, search, searchAgents):
+        lay = layout.Layout([l.strip() for l in self.layout_text.split('\n')])
+        start_state = pacman.GameState()
+        start_state.initialize(lay, 0)
+
+        expected = []
+        for start, goal in self.queries:
+            problem = searchAgents.PositionSearchProblem(start_state, start=start, goal=goal, warn=False, visualize=False)
+            expected.append((start, goal, search.breadthFirstSearch(problem)))
+        answers = list(searchAgents.batchMazeSearch(lay, self.queries, maxWorkers=self.maxWorkers))
+
+        for start, goal, actions in answers:
+            if (start, goal, actions) not in expected:
+                return 'batchMazeSearch answered %s -> %s with a path of %s actions that breadthFirstSearch does not return' % \
+                    (start, goal, len(actions) if actions is not None else None)
+            expected.remove((start, goal, actions))
+        if expected:
+            start, goal, _ = expected[0]
+            return 'batchMazeSearch did not answer %d queries, such as %s -> %s' % (len(expected), start, goal)
+        return None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        error = self.getSolInfo(moduleDict['search'], moduleDict['searchAgents'])
+        if error != None:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('%s' % error)
+            return False
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
+        grades.addMessage('\tqueries:\t\t%s' % len(self.queries))
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# This test has no solution to compare against.\n')
+        handle.close()
+        return True
+
+
+class ReplanningTest(testClasses.TestCase):
+    """
+    Plans from Pacman to the food of a layout with search.DStarLite and
+    replays a script of changes, one per line of operations:
+
+      wall x y      open x y      move x y      path
+
+    wall and open change one cell, move puts Pacman on another cell, and
+    path asks for a new plan.  Every plan must be a legal path to the food
+    on the current walls, as short as a fresh breadth first search finds,
+    or None exactly when the food cannot be reached.
+    """
+
+    def __init__(self, question, testDict):
+        super(ReplanningTest, self).__init__(question, testDict)
+        self.layout_text = testDict['layout']
+        self.layoutName = testDict['layoutName']
+        self.operations = [line.split() for line in testDict['operations'].split('\n') if line.strip()]
+
+    def shortestDistance(self, walls, start, goal):
+        distance = {start: 0}
+        layer = [start]
+        while layer:
+            nextLayer = []
+            for x, y in layer:
+                for cell in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+                    if cell not in distance and not walls[cell[0]][cell[1]]:
+                        distance[cell] = distance[(x, y)] + 1
+                        nextLayer.append(cell)
+            layer = nextLayer
+        return distance.get(goal)
+
+    def checkPath(self, path, walls, start, goal):
+        from game import Actions
+        best = self.shortestDistance(walls, start, goal)
+        if path is None or best is None:
+            if path is None and best is None:
+                return None
+            return 'DStarLite returned %s, the shortest path has %s moves' % (
+                'None' if path is None else '%d moves' % len(path), best)
+        position = start
+        for action in path:
+            dx, dy = Actions.directionToVector(action)
+            position = (int(position[0] + dx), int(position[1] + dy))
+            if walls[position[0]][position[1]]:
+                return 'The path from %s walks into the wall at %s' % (start, position)
+        if position != goal:
+            return 'The path from %s ends at %s instead of %s' % (start, position, goal)
+        if len(path) != best:
+            return 'DStarLite returned %d moves from %s, the shortest path has %d' % (len(path), start, best)
+        return None
+
+    def run(self, search):
+        lay = layout.Layout([l.strip() for l in self.layout_text.split('\n')])
+        walls = lay.walls.copy()
+        start = [position for isPacman, position in lay.agentPositions if isPacman][0]
+        goal = lay.food.asList()[0]
+        planner = search.DStarLite(walls, start, goal)
+
+        for operation in self.operations:
+            command = operation[0]
+            if command == 'path':
+                error = self.checkPath(planner.getPath(), walls, start, goal)
+                if error != None:
+                    return error
+                continue
+            position = (int(operation[1]), int(operation[2]))
+            if command in ('wall', 'open'):
+                walls[position[0]][position[1]] = command == 'wall'
+                planner.setWall(position, command == 'wall')
+            elif command == 'move':
+                start = position
+                planner.moveStart(position)
+            else:
+                raise Exception('Unknown replanning operation: %s' % ' '.join(operation))
+        return None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        error = self.run(moduleDict['search'])
+        if error != None:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('%s' % error)
+            return False
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# Every plan is checked against a breadth first search.\n')
+        handle.close()
+        return True
+
+
+class PatternDatabaseTest(testClasses.TestCase):
+    """
+    Checks the additive pattern database heuristic of patternDatabase.py on
+    the eight puzzle: h(goal) == 0, h changes by at most 1 along every move
+    within radius moves of each puzzle, and aStarSearch with it finds plans
+    as short as breadthFirstSearch.
+    """
+
+    def __init__(self, question, testDict):
+        super(PatternDatabaseTest, self).__init__(question, testDict)
+        self.puzzles = [[int(n) for n in line.split()] for line in testDict['puzzles'].split('\n') if line.strip()]
+        self.radius = int(testDict['radius'])
+
+    def checkConsistency(self, heuristic, eightpuzzle, puzzle):
+        # Breadth first over the states within radius moves of puzzle
+        start = eightpuzzle.EightPuzzleState(puzzle)
+        seen = set([start])
+        layer = [start]
+        for depth in range(self.radius):
+            next_layer = []
+            for state in layer:
+                h0 = heuristic(state)
+                for move in state.legalMoves():
+                    successor = state.result(move)
+                    if abs(h0 - heuristic(successor)) > 1:
+                        return 'Heuristic failed consistency test between\n%s\nand\n%s' % (state, successor)
+                    if successor not in seen:
+                        seen.add(successor)
+                        next_layer.append(successor)
+            layer = next_layer
+        return None
+
+    def getSolInfo(self, search):
+        import eightpuzzle
+        import patternDatabase
+        heuristic = patternDatabase.AdditivePatternHeuristic(3, cacheDir=None)
+        if heuristic(list(range(9))) != 0:
+            return 'Heuristic failed H(goal) == 0 test'
+        for puzzle in self.puzzles:
+            error = self.checkConsistency(heuristic, eightpuzzle, puzzle)
+            if error != None:
+                return error
+            problem = eightpuzzle.EightPuzzleSearchProblem(eightpuzzle.EightPuzzleState(puzzle))
+            astar_cost = len(search.aStarSearch(problem, heuristic))
+            bfs_cost = len(search.breadthFirstSearch(problem))
+            if astar_cost != bfs_cost:
+                return 'A* found a plan of %d moves for %s, the optimum is %d' % (astar_cost, puzzle, bfs_cost)
+        return None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        error = self.getSolInfo(moduleDict['search'])
+        if error != None:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('%s' % error)
+            return False
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tpuzzles:\t\t%s' % len(self.puzzles))
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# This test has no solution to compare against.\n')
+        handle.close()
+        return True
+
+
+class HeuristicCacheTest(testClasses.TestCase):
+    """
+    Runs a search that revisits states (search.idastar by default) with a
+    HeuristicCache of cacheSize entries and checks the statistics it leaves
+    in search.lastResult: the heuristic itself runs once per distinct state
+    (the misses), the hits and misses add up to the heuristic calls of the
+    same search without a cache, some of them are hits, and the cache does
+    not change the path cost.
+    """
+
+    def __init__(self, question, testDict):
+        super(HeuristicCacheTest, self).__init__(question, testDict)
+        self.layout_text = testDict['layout']
+        self.alg = testDict.get('algorithm', 'iterativeDeepeningAStarSearch')
+        self.layoutName = testDict['layoutName']
+        self.searchProblemClassName = testDict.get('searchProblemClass', 'PositionSearchProblem')
+        self.heuristicName = testDict['heuristic']
+        self.cacheSize = int(testDict['cacheSize'])
+
+    def runSearch(self, search, searchAgents, cacheSize):
+        alg = getattr(search, self.alg)
+        lay = layout.Layout([l.strip() for l in self.layout_text.split('\n')])
+        start_state = pacman.GameState()
+        start_state.initialize(lay, 0)
+        problem = getattr(searchAgents, self.searchProblemClassName)(start_state)
+        heuristic = getattr(searchAgents, self.heuristicName)
+
+        calls = []
+        def countingHeuristic(state, problem=None):
+            calls.append(state)
+            return heuristic(state, problem)
+
+        solution = alg(problem, countingHeuristic, cacheSize=cacheSize)
+        cost = problem.getCostOfActions(solution) if solution is not None else None
+        return cost, calls, search.lastResult
+
+    def getSolInfo(self, search, searchAgents):
+        cost, calls, result = self.runSearch(search, searchAgents, self.cacheSize)
+        plain_cost, plain_calls, plain_result = self.runSearch(search, searchAgents, 0)
+        if plain_result.heuristicHits or plain_result.heuristicMisses:
+            return None, 'Without a cache %s still reports %d hits / %d misses' % \
+                (self.alg, plain_result.heuristicHits, plain_result.heuristicMisses)
+        if cost != plain_cost:
+            return None, 'The cache changed the path cost from %s to %s' % (plain_cost, cost)
+        if result.heuristicMisses != len(calls) or len(calls) != len(set(calls)):
+            return None, 'The heuristic ran %d times on %d distinct states for %d misses' % \
+                (len(calls), len(set(calls)), result.heuristicMisses)
+        if result.heuristicHits + result.heuristicMisses != len(plain_calls):
+            return None, '%d hits + %d misses, but the search without a cache called the heuristic %d times' % \
+                (result.heuristicHits, result.heuristicMisses, len(plain_calls))
+        if result.heuristicHits == 0:
+            return None, 'The cache was never hit'
+        return result, None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        search = moduleDict['search']
+        searchAgents = moduleDict['searchAgents']
+
+        result, error = self.getSolInfo(search, searchAgents)
+        if error != None:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('%s' % error)
+            return False
+
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
+        grades.addMessage('\tcache hits:\t\t%s' % result.heuristicHits)
+        grades.addMessage('\tcache misses:\t\t%s' % result.heuristicMisses)
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# This test has no solution to compare against.\n')
+        handle.close()
+        return True
+
+
+class MazeDistanceTest(testClasses.TestCase):
+    """
+    Checks searchAgents.mazeDistance against the length of the path
+    breadthFirstSearch finds between every pair of open cells of the
+    layout, and that it does not write to disk.  The distances an oracle
+    reads back from an explicit cacheDir must be the same.
+    """
+
+    def __init__(self, question, testDict):
+        super(MazeDistanceTest, self).__init__(question, testDict)
+        self.layout_text = testDict['layout']
+        self.layoutName = testDict['layoutName']
+
+    def getSolInfo(self, search, searchAgents):
+        import tempfile
+        lay = layout.Layout([l.strip() for l in self.layout_text.split('\n')])
+        start_state = pacman.GameState()
+        start_state.initialize(lay, 0)
+        cells = lay.walls.asList(False)
+
+        oracleClass = searchAgents.MazeDistanceOracle
+        save = oracleClass._save
+        def failingSave(oracle, cacheDir):
+            raise AssertionError('mazeDistance wrote its distances to %s' % cacheDir)
+        oracleClass._instances.pop(oracleClass.layoutKey(lay), None)
+        oracleClass._save = failingSave
+        try:
+            for source in cells:
+                for goal in cells:
+                    problem = searchAgents.PositionSearchProblem(start_state, start=source, goal=goal,
+                                                                 warn=False, visualize=False)
+                    distance = searchAgents.mazeDistance(source, goal, start_state)
+                    moves = len(search.breadthFirstSearch(problem))
+                    if distance != moves:
+                        return 'mazeDistance%s is %s, the shortest path takes %d moves' % \
+                            ((source, goal), distance, moves)
+        except AssertionError as e:
+            return str(e)
+        finally:
+            oracleClass._save = save
+
+        with tempfile.TemporaryDirectory() as cacheDir:
+            written = oracleClass(lay, cacheDir).distances
+            read = oracleClass(lay, cacheDir).distances
+        if read != written or read != oracleClass.forLayout(lay).distances:
+            return 'The distances read back from a cacheDir differ from the computed ones'
+        return None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        error = self.getSolInfo(moduleDict['search'], moduleDict['searchAgents'])
+        if error != None:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('%s' % error)
+            return False
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# This test has no solution to compare against.\n')
+        handle.close()
+        return True
+
+
+class ClosestDotTourTest(testClasses.TestCase):
+    """
+    Checks the tour of searchAgents.ClosestDotPlanner against the one built
+    by repeated breadthFirstSearch legs, each from the end of the last one
+    to the closest remaining dot: both must take the same actions, and so
+    have the same length.
+    """
+
+    def __init__(self, question, testDict):
+        super(ClosestDotTourTest, self).__init__(question, testDict)
+        self.layoutText = testDict['layout']
+        self.layoutName = testDict['layoutName']
+
+    def bfsTour(self, search, searchAgents, gameState):
+        position = gameState.getPacmanPosition()
+        food = set(gameState.getFood().asList()) - set([position])
+        actions = []
+        while food:
+            problem = searchAgents.PositionSearchProblem(gameState, start=position, warn=False, visualize=False)
+            problem.isGoalState = lambda state: state in food
+            leg = search.breadthFirstSearch(problem)
+            for action in leg:
+                dx, dy = Actions.directionToVector(action)
+                position = (int(position[0] + dx), int(position[1] + dy))
+                food.discard(position)
+            actions += leg
+        return actions
+
+    def getSolInfo(self, search, searchAgents):
+        lay = layout.Layout([l.strip() for l in self.layoutText.split('\n')])
+        gameState = pacman.GameState()
+        gameState.initialize(lay, 0)
+        planner = searchAgents.ClosestDotPlanner(lay)
+        tour = planner.plan(gameState.getPacmanPosition(), gameState.getFood())
+        return tour, self.bfsTour(search, searchAgents, gameState)
+
+    def execute(self, grades, moduleDict, solutionDict):
+        search = moduleDict['search']
+        searchAgents = moduleDict['searchAgents']
+        tour, bfs_tour = self.getSolInfo(search, searchAgents)
+
+        if tour != bfs_tour:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('The planned tour differs from the breadthFirstSearch legs')
+            grades.addMessage('\tplanned tour length:\t%s' % len(tour))
+            grades.addMessage('\tbfs tour length:\t%s' % len(bfs_tour))
+            return False
+
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
+        grades.addMessage('\ttour length:\t\t%s' % len(tour))
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# This test has no solution to compare against.\n')
+        handle.close()
+        return True
+
+
+class CompactFoodSearchTest(testClasses.TestCase):
+    """
+    Checks searchAgents.CompactFoodSearchProblem against FoodSearchProblem on
+    every state within radius moves of the start: the same goal test and the
+    same successors, actions, costs and remaining food.  Each of the given
+    food heuristics must be 0 on goals and consistent along those moves, and
+    aStarSearch with it on the compact problem must find a path of the
+    optimal cost.
+    """
+
+    def __init__(self, question, testDict):
+        super(CompactFoodSearchTest, self).__init__(question, testDict)
+        self.layoutText = testDict['layout']
+        self.layoutName = testDict['layoutName']
+        self.heuristicNames = testDict['heuristics'].split()
+        self.radius = int(testDict['radius'])
+
+    def makeProblems(self, searchAgents):
+        lay = layout.Layout([l.strip() for l in self.layoutText.split('\n')])
+        gameState = pacman.GameState()
+        gameState.initialize(lay, 0)
+        return searchAgents.FoodSearchProblem(gameState), searchAgents.CompactFoodSearchProblem(gameState)
+
+    def describe(self, state):
+        return 'Pacman at %s with %d dots left' % (state[0], state[1].count())
+
+    def checkStates(self, searchAgents):
+        # Breadth first over pairs of matching states of the two problems
+        problem, compact = self.makeProblems(searchAgents)
+        heuristics = [(name, getattr(searchAgents, name)) for name in self.heuristicNames]
+        start = (problem.getStartState(), compact.getStartState())
+        seen = set([start[0]])
+        layer = [start]
+        for depth in range(self.radius + 1):
+            next_layer = []
+            for state, compact_state in layer:
+                if problem.isGoalState(state) != compact.isGoalState(compact_state):
+                    return 'The goal tests disagree with %s' % self.describe(state)
+                values = dict((name, heuristic(compact_state, compact)) for name, heuristic in heuristics)
+                for name, value in values.items():
+                    if value < 0 or (compact.isGoalState(compact_state) and value != 0):
+                        return '%s is %s with %s' % (name, value, self.describe(state))
+                successors = problem.getSuccessors(state)
+                compact_successors = compact.getSuccessors(compact_state)
+                if [(s[0], sorted(s[1].asList()), a, c) for s, a, c in successors] != \
+                   [(s[0], sorted(s[1].asList()), a, c) for s, a, c in compact_successors]:
+                    return 'The successors differ with %s' % self.describe(state)
+                for (successor, _, cost), (compact_successor, _, _) in zip(successors, compact_successors):
+                    for name, heuristic in heuristics:
+                        if values[name] - heuristic(compact_successor, compact) > cost:
+                            return '%s is not consistent between %s and %s' % \
+                                (name, self.describe(state), self.describe(successor))
+                    if depth < self.radius and successor not in seen:
+                        seen.add(successor)
+                        next_layer.append((successor, compact_successor))
+            layer = next_layer
+        return None
+
+    def getSolInfo(self, search, searchAgents, gold_cost):
+        error = self.checkStates(searchAgents)
+        if error != None:
+            return error
+        for name in self.heuristicNames:
+            _, compact = self.makeProblems(searchAgents)
+            solution = search.aStarSearch(compact, getattr(searchAgents, name))
+            if not checkSolution(compact, solution):
+                return 'The path aStarSearch returns with %s does not eat all the food' % name
+            if len(solution) != gold_cost:
+                return 'aStarSearch with %s found a path of cost %d, the optimum is %d' % (name, len(solution), gold_cost)
+        return None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        search = moduleDict['search']
+        searchAgents = moduleDict['searchAgents']
+        gold_cost = int(solutionDict['solution_cost'])
+        error = self.getSolInfo(search, searchAgents, gold_cost)
+        if error != None:
+            grades.addMessage('FAIL: %s' % self.path)
+            grades.addMessage('%s' % error)
+            return False
+        grades.addMessage('PASS: %s' % self.path)
+        grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
+        grades.addMessage('\tsolution cost:\t\t%s' % gold_cost)
+        return True
+
+    def writeSolution(self, moduleDict, filePath):
+        search = moduleDict['search']
+        searchAgents = moduleDict['searchAgents']
+        problem, _ = self.makeProblems(searchAgents)
+        cost = len(search.uniformCostSearch(problem))
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# The cost is that of the path uniformCostSearch returns on the FoodSearchProblem.\n')
+        handle.write('solution_cost: "%s"\n' % cost)
+        handle.close()
+        return True
+
+
 from game import Actions
 def getStatesFromPath(start, path):
     "Returns the list of states visited along the path"
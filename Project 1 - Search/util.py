@@ -29,6 +29,7 @@
 import sys
 import inspect
 import heapq, random
+from collections import deque
 
 
 class FixedRandom:
@@ -221,6 +222,223 @@ class PriorityQueueWithFunction(PriorityQueue):
         "Adds an item to the queue with priority from the priority function"
         PriorityQueue.push(self, item, self.priorityFunction(item))
 
+class IndexedPriorityQueue:
+    """
+      A priority queue over hashable items that also keeps an index from
+      every item to its slot in the binary heap.  Membership tests and
+      priority lookups are O(1) and update (decrease-key) is O(log n), so
+      callers never have to scan the heap to find an item.
+
+      Items are unique: pushing an item that is already queued behaves like
+      update.  Ties between equal priorities are broken in insertion order,
+      and an item keeps its place in that order when its priority is lowered
+      (the same behaviour as PriorityQueue.update).
+
+      With lazy=True, update pushes a fresh heap entry instead of sifting the
+      existing one, and stale entries are thrown away when they reach the
+      top of the heap.  This trades some memory for cheaper updates when
+      priorities are lowered many times.
+    """
+    def __init__(self, lazy=False):
+        self.heap = []
+        self.index = {}     # item -> heap slot (eager) or live entry (lazy)
+        self.count = 0
+        self.lazy = lazy
+
+    def push(self, item, priority):
+        if item in self.index:
+            self.update(item, priority)
+            return
+        entry = (priority, self.count, item)
+        self.count += 1
+        if self.lazy:
+            self.index[item] = entry
+            heapq.heappush(self.heap, entry)
+        else:
+            self.heap.append(entry)
+            self.index[item] = len(self.heap) - 1
+            self._siftUp(len(self.heap) - 1)
+
+    def pop(self):
+        return self.popWithPriority()[1]
+
+    def popWithPriority(self):
+        "Removes the lowest-priority item and returns a (priority, item) pair"
+        if self.lazy:
+            while True:
+                entry = heapq.heappop(self.heap)
+                if self.index.get(entry[2]) is entry:
+                    del self.index[entry[2]]
+                    return entry[0], entry[2]
+        heap = self.heap
+        entry = heap[0]
+        last = heap.pop()
+        del self.index[entry[2]]
+        if heap:
+            heap[0] = last
+            self.index[last[2]] = 0
+            self._siftDown(0)
+        return entry[0], entry[2]
+
+    def isEmpty(self):
+        return len(self.index) == 0
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, item):
+        return item in self.index
+
+    def __iter__(self):
+        "Iterates over the queued items, in no particular order"
+        return iter(self.index)
+
+    def getPriority(self, item):
+        "Returns the priority item is queued with (KeyError if it is not queued)"
+        if self.lazy:
+            return self.index[item][0]
+        return self.heap[self.index[item]][0]
+
+    def peekPriority(self):
+        "Returns the lowest priority in the queue without removing its item"
+        if self.lazy:
+            while self.index.get(self.heap[0][2]) is not self.heap[0]:
+                heapq.heappop(self.heap)
+        return self.heap[0][0]
+
+    def update(self, item, priority):
+        # If item already in priority queue with higher priority, lower its priority.
+        # If item already in priority queue with equal or lower priority, do nothing.
+        # If item not in priority queue, do the same thing as self.push.
+        if item not in self.index:
+            self.push(item, priority)
+            return
+        if self.lazy:
+            old = self.index[item]
+            if old[0] <= priority:
+                return
+            entry = (priority, old[1], item)
+            self.index[item] = entry
+            heapq.heappush(self.heap, entry)
+        else:
+            slot = self.index[item]
+            old = self.heap[slot]
+            if old[0] <= priority:
+                return
+            self.heap[slot] = (priority, old[1], item)
+            self._siftUp(slot)
+
+    def _siftUp(self, slot):
+        heap, index = self.heap, self.index
+        entry = heap[slot]
+        key = entry[:2]
+        while slot > 0:
+            parentSlot = (slot - 1) >> 1
+            parent = heap[parentSlot]
+            if parent[:2] <= key:
+                break
+            heap[slot] = parent
+            index[parent[2]] = slot
+            slot = parentSlot
+        heap[slot] = entry
+        index[entry[2]] = slot
+
+    def _siftDown(self, slot):
+        heap, index = self.heap, self.index
+        size = len(heap)
+        entry = heap[slot]
+        key = entry[:2]
+        while True:
+            child = 2 * slot + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1][:2] < heap[child][:2]:
+                child += 1
+            if key <= heap[child][:2]:
+                break
+            heap[slot] = heap[child]
+            index[heap[slot][2]] = slot
+            slot = child
+        heap[slot] = entry
+        index[entry[2]] = slot
+
+
+class BucketQueue:
+    """
+      A monotone priority queue for small non-negative integer priorities
+      (Dial's bucket queue).  There is one bucket per priority value, so push
+      is O(1) and pop only has to walk forward over empty buckets, which is
+      cheap when priorities grow slowly, as path costs in a search do.
+
+      Items with equal priority are ordered by an optional non-negative
+      integer tie key (lowest first) and then in insertion order.  Like
+      IndexedPriorityQueue, items are unique and can be looked up by item;
+      update lowers the priority of a queued item by leaving a stale entry
+      behind, which is skipped when it is reached.
+    """
+    def __init__(self):
+        self.buckets = []       # priority -> list of FIFO slots indexed by tie key
+        self.index = {}         # item -> live entry (priority, tie, item)
+        self.minPriority = 0    # no live entry has a lower priority than this
+
+    def push(self, item, priority, tie=0):
+        if item in self.index:
+            self.update(item, priority, tie)
+            return
+        self._insert(item, priority, tie)
+
+    def _insert(self, item, priority, tie):
+        if type(priority) is not int or type(tie) is not int or priority < 0 or tie < 0:
+            raise ValueError('BucketQueue priorities must be non-negative integers, got %s' % priority)
+        entry = (priority, tie, item)
+        self.index[item] = entry
+        buckets = self.buckets
+        while len(buckets) <= priority:
+            buckets.append([])
+        bucket = buckets[priority]
+        while len(bucket) <= tie:
+            bucket.append(deque())
+        bucket[tie].append(entry)
+        if priority < self.minPriority:
+            self.minPriority = priority
+
+    def pop(self):
+        return self.popWithPriority()[1]
+
+    def popWithPriority(self):
+        "Removes the lowest-priority item and returns a (priority, item) pair"
+        if not self.index:
+            raise IndexError('pop from an empty BucketQueue')
+        buckets, index = self.buckets, self.index
+        priority = self.minPriority
+        while True:
+            for slot in buckets[priority]:
+                while slot:
+                    entry = slot.popleft()
+                    if index.get(entry[2]) is entry:
+                        del index[entry[2]]
+                        self.minPriority = priority
+                        return priority, entry[2]
+            priority += 1
+
+    def isEmpty(self):
+        return len(self.index) == 0
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, item):
+        return item in self.index
+
+    def getPriority(self, item):
+        "Returns the priority item is queued with (KeyError if it is not queued)"
+        return self.index[item][0]
+
+    def update(self, item, priority, tie=0):
+        # Same contract as PriorityQueue.update: only ever lowers a priority.
+        old = self.index.get(item)
+        if old is None or (priority, tie) < old[:2]:
+            self._insert(item, priority, tie)
 
 def manhattanDistance( xy1, xy2 ):
     "Returns the Manhattan distance between points xy1 and xy2"
@@ -641,6 +859,21 @@ class TimeoutFunction:
         return result
 
 
+import multiprocessing
+def makeProcessPool(workers, initializer=None, initargs=()):
+    """
+    Returns a multiprocessing.Pool of workers processes that run initializer
+    on initargs first.  Where possible the workers are forked, so initargs
+    need not be picklable; elsewhere they must be.  The caller stops the
+    workers with terminate(), which also kills tasks that are still running.
+    """
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    else:
+        context = multiprocessing.get_context()
+    return context.Pool(workers, initializer, initargs)
+
+
 
 _ORIGINAL_STDOUT = None
 _ORIGINAL_STDERR = None
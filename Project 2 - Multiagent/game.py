@@ -23,6 +23,7 @@
 from util import *
 import time
 import os
+import random
 import traceback
 import sys
 
@@ -79,7 +80,11 @@ class Configuration:
 
     The convention for positions, like a graph, is that (0,0) is the lower left corner, x increases
     horizontally and y increases vertically.  Therefore, north is the direction of increasing y, or (0,1).
+
+    Configurations are shared between states, so they are never changed:
+    moving an agent gives it a new Configuration.
     """
+    __slots__ = ('pos', 'direction')
 
     def __init__(self, pos, direction):
         self.pos = pos
@@ -128,6 +133,7 @@ class AgentState:
     """
     AgentStates hold the state of an agent (configuration, speed, scared, etc).
     """
+    __slots__ = ('start', 'configuration', 'isPacman', 'scaredTimer', 'numCarrying', 'numReturned')
 
     def __init__(self, startConfiguration, isPacman):
         self.start = startConfiguration
@@ -205,6 +211,8 @@ class Grid:
     def __eq__(self, other):
         if other == None:
             return False
+        if isinstance(other, PackedGrid):
+            return other == self
         return self.data == other.data
 
     def __hash__(self):
@@ -293,6 +301,134 @@ class Grid:
         return bools
 
 
+class PackedGrid(Grid):
+    """
+    A Grid of booleans packed into a single Python int, with the bit for
+    (x,y) at index x * height + y.  It keeps the grid[x][y] interface (reads
+    and writes go through a column view made on each grid[x]) but the operations that walk
+    a list-of-lists Grid become int operations: copy() shares the immutable
+    int until one of the copies is written to, count() is a popcount,
+    asList() only visits set bits, and equality and hashing compare and hash
+    one int.  The hash is the same value Grid computes for the same cells.
+
+    Unlike Grid it can only hold booleans, and shallowCopy() is the same as
+    copy(): writes are never shared between two PackedGrids.
+    """
+    def __init__(self, width, height, initialValue=False, bitRepresentation=None):
+        if initialValue not in [False, True]:
+            raise Exception('Grids can only contain booleans')
+        self.CELLS_PER_INT = 30
+
+        self.width = width
+        self.height = height
+        self.bits = (1 << (width * height)) - 1 if initialValue else 0
+        self._hash = None
+        if bitRepresentation:
+            self._unpackBits(bitRepresentation)
+
+    def fromGrid(grid):
+        "Returns a PackedGrid holding the same cells as grid"
+        packed = PackedGrid(grid.width, grid.height)
+        for x, y in grid.asList():
+            packed.bits |= 1 << (x * grid.height + y)
+        return packed
+    fromGrid = staticmethod(fromGrid)
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.width:
+            if not -self.width <= i < 0:
+                raise IndexError('grid index out of range')
+            i += self.width
+        return PackedGridColumn(self, i * self.height)
+
+    def __setitem__(self, key, item):
+        column = self[key]
+        for y in range(self.height):
+            column[y] = item[y]
+
+    def __iter__(self):
+        return iter(self[x] for x in range(self.width))
+
+    def _set(self, index, value):
+        bit = 1 << index
+        if value:
+            self.bits |= bit
+        else:
+            self.bits &= ~bit
+        self._hash = None
+
+    def __str__(self):
+        out = [[str(self[x][y])[0] for x in range(self.width)] for y in range(self.height)]
+        out.reverse()
+        return '\n'.join([''.join(x) for x in out])
+
+    def __eq__(self, other):
+        if other == None:
+            return False
+        if isinstance(other, PackedGrid):
+            return self.bits == other.bits and self.height == other.height
+        return self.asList() == other.asList() and self.height == other.height
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(self.bits)
+        return self._hash
+
+    def copy(self):
+        g = PackedGrid(self.width, self.height)
+        g.bits = self.bits
+        g._hash = self._hash
+        return g
+
+    def deepCopy(self):
+        return self.copy()
+
+    def shallowCopy(self):
+        return self.copy()
+
+    def count(self, item=True):
+        ones = self.bits.bit_count()
+        if item:
+            return ones
+        return self.width * self.height - ones
+
+    def asList(self, key=True):
+        if not key:
+            return [(x, y) for x in range(self.width) for y in range(self.height) if not self[x][y]]
+        list = []
+        bits = self.bits
+        while bits:
+            low = bits & -bits
+            index = low.bit_length() - 1
+            list.append((index // self.height, index % self.height))
+            bits ^= low
+        return list
+
+class PackedGridColumn:
+    "Column view of a PackedGrid, so that grid[x][y] reads and writes bits."
+    __slots__ = ('grid', 'base')
+
+    def __init__(self, grid, base):
+        self.grid = grid
+        self.base = base
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.grid.height:
+            if not -self.grid.height <= y < 0:
+                raise IndexError('grid index out of range')
+            y += self.grid.height
+        return (self.grid.bits >> (self.base + y)) & 1 == 1
+
+    def __setitem__(self, y, value):
+        if not 0 <= y < self.grid.height:
+            if not -self.grid.height <= y < 0:
+                raise IndexError('grid index out of range')
+            y += self.grid.height
+        self.grid._set(self.base + y, value)
+
+    def __len__(self):
+        return self.grid.height
+
 def reconstituteGrid(bitRep):
     if type(bitRep) is not type((1, 2)):
         return bitRep
@@ -393,19 +529,68 @@ class Actions:
     getSuccessor = staticmethod(getSuccessor)
 
 
+class ZobristTable:
+    """
+    The random 64 bit numbers of Zobrist hashing.  A GameStateData keeps the
+    XOR of the numbers of its parts (each agent's position, direction and
+    scared timer, each food pellet and each capsule), so the rules can keep
+    it up to date by XORing a part out before changing it and back in after.
+
+    Numbers are drawn the first time a part is seen from a private
+    random.Random, leaving the global random numbers used by the ghosts and
+    the autograder alone.  There is one table, ZOBRIST, for every layout, so
+    equal states hash equally even when their layouts are copies.
+    """
+    def __init__(self, seed=0x5eed):
+        self.random = random.Random(seed)
+        self.keys = {}
+
+    def key(self, *part):
+        value = self.keys.get(part)
+        if value is None:
+            value = self.keys[part] = self.random.getrandbits(64)
+        return value
+
+    def agent(self, index, agentState):
+        configuration = agentState.configuration
+        value = self.key(index, configuration.pos, configuration.direction)
+        if agentState.scaredTimer:
+            value ^= self.key(index, agentState.scaredTimer)
+        return value
+
+    def food(self, x, y):
+        return self.key('food', x, y)
+
+    def capsule(self, position):
+        return self.key('capsule', position)
+
+ZOBRIST = ZobristTable()
+
 class GameStateData:
+    """
+    The data of a GameState.  A successor starts out sharing the food grid,
+    the capsule list and every AgentState with its predecessor, and the
+    rules copy what they change: an AgentState through ownAgentState, the
+    food and capsules by replacing them with changed copies.  Anything read
+    from a GameStateData must therefore be treated as read only.
+    """
+    __slots__ = ('food', 'capsules', 'agentStates', 'layout', 'score', 'scoreChange', 'zobrist',
+                 '_eaten', '_foodEaten', '_foodAdded', '_capsuleEaten', '_agentMoved', '_lose', '_win',
+                 '_ownedAgents')
 
     def __init__(self, prevState=None):
         """
         Generates a new data packet by copying information from its predecessor.
         """
         if prevState != None:
-            self.food = prevState.food.shallowCopy()
-            self.capsules = prevState.capsules[:]
-            self.agentStates = self.copyAgentStates(prevState.agentStates)
+            self.food = prevState.food
+            self.capsules = prevState.capsules
+            self.agentStates = prevState.agentStates[:]
             self.layout = prevState.layout
             self._eaten = prevState._eaten
             self.score = prevState.score
+            self.zobrist = prevState.zobrist
+        self._ownedAgents = 0
 
         self._foodEaten = None
         self._foodAdded = None
@@ -418,6 +603,9 @@ class GameStateData:
     def deepCopy(self):
         state = GameStateData(self)
         state.food = self.food.deepCopy()
+        state.capsules = self.capsules[:]
+        state.agentStates = self.copyAgentStates(self.agentStates)
+        state._ownedAgents = (1 << len(state.agentStates)) - 1
         state.layout = self.layout.deepCopy()
         state._agentMoved = self._agentMoved
         state._foodEaten = self._foodEaten
@@ -431,6 +619,16 @@ class GameStateData:
             copiedStates.append(agentState.copy())
         return copiedStates
 
+    def ownAgentState(self, index):
+        """
+        Returns the AgentState of agent index, first replacing it with a copy
+        if it is still shared with the predecessor, so that it can be changed.
+        """
+        if not (self._ownedAgents >> index) & 1:
+            self.agentStates[index] = self.agentStates[index].copy()
+            self._ownedAgents |= 1 << index
+        return self.agentStates[index]
+
     def __eq__(self, other):
         """
         Allows two states to be compared.
@@ -438,6 +636,8 @@ class GameStateData:
         if other == None:
             return False
         # TODO Check for type of other
+        if self.zobrist != other.zobrist:
+            return False
         if not self.agentStates == other.agentStates:
             return False
         if not self.food == other.food:
@@ -452,13 +652,21 @@ class GameStateData:
         """
         Allows states to be keys of dictionaries.
         """
-        for i, state in enumerate(self.agentStates):
-            try:
-                int(hash(state))
-            except TypeError as e:
-                print(e)
-                # hash(state)
-        return int((hash(tuple(self.agentStates)) + 13*hash(self.food) + 113 * hash(tuple(self.capsules)) + 7 * hash(self.score)) % 1048575)
+        return hash((self.zobrist, self.score))
+
+    def computeZobrist(self):
+        """
+        The Zobrist hash of the agents, food and capsules computed from
+        scratch; the rules keep self.zobrist equal to it as the state changes.
+        """
+        zobrist = 0
+        for index, agentState in enumerate(self.agentStates):
+            zobrist ^= ZOBRIST.agent(index, agentState)
+        for x, y in self.food.asList():
+            zobrist ^= ZOBRIST.food(x, y)
+        for position in self.capsules:
+            zobrist ^= ZOBRIST.capsule(position)
+        return zobrist
 
     def __str__(self):
         width, height = self.layout.width, self.layout.height
@@ -536,6 +744,8 @@ class GameStateData:
             self.agentStates.append(AgentState(
                 Configuration(pos, Directions.STOP), isPacman))
         self._eaten = [False for a in self.agentStates]
+        self._ownedAgents = (1 << len(self.agentStates)) - 1
+        self.zobrist = self.computeZobrist()
 
 
 try:
@@ -14,7 +14,7 @@
 
 from util import manhattanDistance
 from game import Directions
-import random, util
+import random, util, time
 
 from game import Agent
 from pacman import GameState
@@ -110,6 +110,17 @@ def scoreEvaluationFunction(currentGameState: GameState):
     """
     return currentGameState.getScore()
 
+def transpositionKey(gameState: GameState):
+    """
+    A hash of everything about gameState that a search below it can depend
+    on: where each agent is and which way it faces, the scared timers, the
+    food and capsules left, the score and whether the game is over.  Used
+    with the agent to move as the key of the transposition table.  The
+    GameState hash covers all but the last and is kept up to date by the
+    rules as successors are generated.
+    """
+    return hash((hash(gameState), gameState.isWin(), gameState.isLose()))
+
 class MultiAgentSearchAgent(Agent):
     """
     This class provides some common elements to all of your
@@ -121,12 +132,21 @@ class MultiAgentSearchAgent(Agent):
     Note: this is an abstract class: one that should not be instantiated.  It's
     only partially specified, and designed to be extended.  Agent (game.py)
     is another abstract class.
+
+    ttSize is the number of slots of a transposition table (util.py) shared
+    by all the searches of the agent, e.g. -a depth=4,ttSize=200000; with
+    the default of 0 every position is searched again each time it is
+    reached.  The table is kept between moves and only ever returns the
+    value of a position searched to the same depth, so the agent chooses
+    the same actions with or without it.
     """
 
-    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '2'):
+    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '2', ttSize = '0'):
         self.index = 0 # Pacman is always agent index 0
         self.evaluationFunction = util.lookup(evalFn, globals())
         self.depth = int(depth)
+        self.transpositionTable = None
+        if (int(ttSize) > 0): self.transpositionTable = util.TranspositionTable(int(ttSize))
 
 class MinimaxAgent(MultiAgentSearchAgent):
     """
@@ -152,10 +172,18 @@ class MinimaxAgent(MultiAgentSearchAgent):
 
         num_of_agents = gameState.getNumAgents()-1
 
+        table = self.transpositionTable
+        if (table is not None): table.newSearch()
+
         def Maximizing(gameState, curr_depth):
             if (curr_depth == 0 or gameState.isWin() or gameState.isLose()):  # base case
                 return self.evaluationFunction(gameState)
             
+            if (table is not None):  # position already searched through another order of moves
+                key = (transpositionKey(gameState), 0)
+                value = table.lookup(key, curr_depth)
+                if (value is not None): return value
+
             max_eval = -9999999
             legal_actions = gameState.getLegalActions(0)
 
@@ -165,12 +193,18 @@ class MinimaxAgent(MultiAgentSearchAgent):
                 eval = Minimizing(new_board, curr_depth-1, 1)
                 if (eval > max_eval): max_eval = eval
                 
+            if (table is not None): table.store(key, curr_depth, max_eval)
             return max_eval
 
         def Minimizing(gameState, curr_depth, agent):
             if (gameState.isWin() or gameState.isLose()):  # base case
                 return self.evaluationFunction(gameState)
             
+            if (table is not None):
+                key = (transpositionKey(gameState), agent)
+                value = table.lookup(key, curr_depth)
+                if (value is not None): return value
+
             min_eval = 9999999
 
             # get legal actions
@@ -187,6 +221,7 @@ class MinimaxAgent(MultiAgentSearchAgent):
 
                 if (eval < min_eval): min_eval = eval
                 
+            if (table is not None): table.store(key, curr_depth, min_eval)
             return min_eval
 
         max_eval = -999999999
@@ -217,10 +252,19 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
         """
         num_of_agents = gameState.getNumAgents()-1
 
+        table = self.transpositionTable
+        if (table is not None): table.newSearch()
+
         def Maximizing(gameState, curr_depth, alpha, beta):
             if (curr_depth == 0 or gameState.isWin() or gameState.isLose()):  # base case
                 return self.evaluationFunction(gameState)
             
+            if (table is not None):  # position already searched through another order of moves
+                key = (transpositionKey(gameState), 0)
+                value = table.lookup(key, curr_depth, alpha, beta)
+                if (value is not None): return value
+                window = (alpha, beta)
+
             max_eval = -9999999
             legal_actions = gameState.getLegalActions(0)
 
@@ -232,15 +276,24 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
 
                 if (eval > max_eval): max_eval = eval
 
-                if (max_eval > beta): return eval  # alpha-beta cut off
+                if (max_eval > beta):  # alpha-beta cut off
+                    if (table is not None): table.store(key, curr_depth, eval, table.LOWER)
+                    return eval
                 if (max_eval > alpha): alpha = max_eval
                 
+            if (table is not None): table.store(key, curr_depth, max_eval, table.boundType(max_eval, *window))
             return max_eval
 
         def Minimizing(gameState, curr_depth, agent, alpha, beta):
             if (gameState.isWin() or gameState.isLose()):  # base case - stop searching
                 return self.evaluationFunction(gameState)
             
+            if (table is not None):
+                key = (transpositionKey(gameState), agent)
+                value = table.lookup(key, curr_depth, alpha, beta)
+                if (value is not None): return value
+                window = (alpha, beta)
+
             min_eval = 9999999
 
             # get legal actions
@@ -257,9 +310,12 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
 
                 if (eval < min_eval): min_eval = eval
 
-                if (min_eval < alpha): return eval  # alpha-beta cut off
+                if (min_eval < alpha):  # alpha-beta cut off
+                    if (table is not None): table.store(key, curr_depth, eval, table.UPPER)
+                    return eval
                 if (min_eval < beta): beta = min_eval
                 
+            if (table is not None): table.store(key, curr_depth, min_eval, table.boundType(min_eval, *window))
             return min_eval
 
         search_depth = self.depth-1
@@ -293,10 +349,18 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
         """
         num_of_agents = gameState.getNumAgents()-1
 
+        table = self.transpositionTable
+        if (table is not None): table.newSearch()
+
         def Maximizing(gameState, curr_depth):
             if (curr_depth == 0 or gameState.isWin() or gameState.isLose()):  # base case
                 return self.evaluationFunction(gameState)
             
+            if (table is not None):  # position already searched through another order of moves
+                key = (transpositionKey(gameState), 0)
+                value = table.lookup(key, curr_depth)
+                if (value is not None): return value
+
             max_eval = -99999999
             legal_actions = gameState.getLegalActions(0)
 
@@ -306,12 +370,18 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
                 eval = Minimizing(new_board, curr_depth-1, 1)
                 if (eval > max_eval): max_eval = eval
                 
+            if (table is not None): table.store(key, curr_depth, max_eval)
             return max_eval
 
         def Minimizing(gameState, curr_depth, agent):
             if (gameState.isWin() or gameState.isLose()):  # base case
                 return self.evaluationFunction(gameState)
             
+            if (table is not None):
+                key = (transpositionKey(gameState), agent)
+                value = table.lookup(key, curr_depth)
+                if (value is not None): return value
+
             total_eval = 0
             num_of_actions = 0
 
@@ -329,7 +399,8 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
 
                 total_eval += eval
                 num_of_actions += 1
-            
+                
+            if (table is not None): table.store(key, curr_depth, total_eval/num_of_actions)
             return total_eval/num_of_actions
 
         max_eval = -999999999
@@ -350,6 +421,159 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
 
         return best_action
 
+class SearchTimeout(Exception):
+    "Raised inside IterativeDeepeningAgent's search when the time for the move is up"
+    pass
+
+class IterativeDeepeningAgent(MultiAgentSearchAgent):
+    """
+    Alpha-beta search run to depth 1, 2, 3, ... until the time for the move
+    runs out, returning the best action of the deepest search that finished.
+
+    Each search tries moves in the order most likely to cause cut offs:
+    first the principal variation of the previous search, then the killer
+    moves that caused cut offs at the same ply, then the rest by their
+    history score (cut offs they caused anywhere, weighted by depth).  A
+    search that runs out of time is thrown away.
+
+    timeLimit is the number of seconds per move, e.g. -a timeLimit=0.5;
+    with the default of 0 the agent uses DEFAULT_TIME_LIMIT.  In a game the
+    limit is capped at TIME_FRACTION of the move timeout of the rules
+    (ClassicGameRules.getMoveTimeout).  depth only bounds the iterations.
+    The tree is searched in place with GameState.applyMove and undoMove.
+    """
+    TIME_FRACTION = 0.5
+    DEFAULT_TIME_LIMIT = 1.0
+
+    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '100', ttSize = '0', timeLimit = '0'):
+        MultiAgentSearchAgent.__init__(self, evalFn, depth, ttSize)
+        self.timeLimit = float(timeLimit)
+        self.moveTimeout = None
+        self.completedDepth = 0
+
+    def setMoveTimeout(self, seconds):
+        "Called by ClassicGameRules.newGame with the rules' move timeout"
+        self.moveTimeout = seconds
+
+    def getTimeLimit(self):
+        limit = self.timeLimit if self.timeLimit > 0 else self.DEFAULT_TIME_LIMIT
+        if (self.moveTimeout): limit = min(limit, self.TIME_FRACTION * self.moveTimeout)
+        return limit
+
+    def getAction(self, gameState: GameState):
+        """
+        Returns the alpha-beta action of the deepest search that finishes
+        within the time limit.  The depth 1 search always finishes.
+        """
+        deadline = time.time() + self.getTimeLimit()
+        self.killers = {}
+        self.history = util.Counter()
+        if (self.transpositionTable is not None): self.transpositionTable.newSearch()
+
+        best_action = None
+        pv = []
+        self.completedDepth = 0
+        for depth in range(1, self.depth+1):
+            try:
+                pv, reached_depth = self.search(gameState, depth, pv, deadline if depth > 1 else None)
+            except SearchTimeout:
+                break
+
+            best_action = pv[0]
+            self.completedDepth = depth
+            if (not reached_depth): break  # every line ended the game, deeper searches change nothing
+
+        return best_action
+
+    def search(self, gameState: GameState, depth, pv, deadline):
+        """
+        One alpha-beta search to depth.  Returns its principal variation and
+        whether any line was cut off by the depth rather than by the end of
+        the game, and raises SearchTimeout once deadline is passed.
+        """
+        num_of_agents = gameState.getNumAgents()
+        board = GameState(gameState)
+        table = self.transpositionTable
+        killers, history = self.killers, self.history
+        pv_table = [[] for ply in range(depth * num_of_agents + 1)]
+        reached_depth = [False]
+
+        def Ordered(legal_actions, ply, agent, pv_action):
+            position = board.data.agentStates[agent].getPosition()
+            killer_actions = killers.get(ply, ())
+
+            def Priority(action):
+                if (action == pv_action): return 2, 0
+                if (action in killer_actions): return 1, 0
+                return 0, history[(agent, position, action)]
+
+            return sorted(legal_actions, key=Priority, reverse=True)
+
+        def CutOff(ply, agent, action, curr_depth):
+            ply_killers = killers.setdefault(ply, [])
+            if (action not in ply_killers):
+                ply_killers.insert(0, action)
+                del ply_killers[2:]
+            position = board.data.agentStates[agent].getPosition()
+            history[(agent, position, action)] += (curr_depth+1) * (curr_depth+1)
+
+        def Search(ply, curr_depth, alpha, beta, on_pv):
+            if (deadline is not None and time.time() > deadline): raise SearchTimeout()
+
+            pv_table[ply] = []
+            agent = ply % num_of_agents
+            if (board.isWin() or board.isLose()):  # base case
+                return self.evaluationFunction(board)
+            if (agent == 0 and curr_depth == 0):  # depth reached
+                reached_depth[0] = True
+                return self.evaluationFunction(board)
+
+            if (table is not None and ply > 0):  # position already searched through another order of moves
+                key = (transpositionKey(board), agent)
+                value = table.lookup(key, curr_depth, alpha, beta)
+                if (value is not None):
+                    reached_depth[0] = True  # not known, so assume the search below was cut off
+                    return value
+                window = (alpha, beta)
+
+            pv_action = pv[ply] if (on_pv and ply < len(pv)) else None
+            next_depth = curr_depth-1 if agent == 0 else curr_depth
+            best_eval = None
+            bound = None
+
+            for action in Ordered(board.getLegalActions(agent), ply, agent, pv_action):
+                # play action in place
+                token = board.applyMove(agent, action)
+                eval = Search(ply+1, next_depth, alpha, beta, action == pv_action)
+                board.undoMove(token)
+
+                if (agent == 0):
+                    if (best_eval is None or eval > best_eval):
+                        best_eval = eval
+                        pv_table[ply] = [action] + pv_table[ply+1]
+                    if (best_eval > beta):  # alpha-beta cut off
+                        CutOff(ply, agent, action, curr_depth)
+                        bound = util.TranspositionTable.LOWER
+                        break
+                    if (best_eval > alpha): alpha = best_eval
+                else:
+                    if (best_eval is None or eval < best_eval):
+                        best_eval = eval
+                        pv_table[ply] = [action] + pv_table[ply+1]
+                    if (best_eval < alpha):  # alpha-beta cut off
+                        CutOff(ply, agent, action, curr_depth)
+                        bound = util.TranspositionTable.UPPER
+                        break
+                    if (best_eval < beta): beta = best_eval
+
+            if (table is not None and ply > 0):
+                if (bound is None): bound = table.boundType(best_eval, *window)
+                table.store(key, curr_depth, best_eval, bound)
+            return best_eval
+
+        Search(0, depth, -float('inf'), float('inf'), True)
+        return pv_table[0], reached_depth[0]
+
 def betterEvaluationFunction(currentGameState: GameState):
     """
     Your extreme ghost-hunting, pellet-nabbing, food-gobbling, unstoppable
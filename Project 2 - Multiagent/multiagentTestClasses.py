@@ -576,3 +576,336 @@ class EvalAgentTest(testClasses.TestCase):
         handle.write('# File intentionally blank.\n')
         handle.close()
         return True
+
+
+class TranspositionTableTest(testClasses.TestCase):
+    """
+    Runs a script of operations on a util.TranspositionTable of size slots
+    and checks every result.  Keys are integers, so key k lives in slot
+    k % size.  Each line of operations is one of
+
+      store key depth value bound       newSearch
+      lookup key depth alpha beta result
+      boundType value alpha beta bound  len n
+
+    where bound is EXACT, LOWER or UPPER, '-' leaves alpha or beta out and
+    result is the expected value or None.
+    """
+
+    def __init__(self, question, testDict):
+        super(TranspositionTableTest, self).__init__(question, testDict)
+        self.size = int(testDict['size'])
+        self.operations = [line.split() for line in testDict['operations'].split('\n') if line.strip()]
+
+    def run(self):
+        import util
+        table = util.TranspositionTable(self.size)
+        bounds = {'EXACT': table.EXACT, 'LOWER': table.LOWER, 'UPPER': table.UPPER}
+        window = lambda text: None if text == '-' else int(text)
+
+        for operation in self.operations:
+            command, args = operation[0], operation[1:]
+            line = ' '.join(operation)
+            if command == 'store':
+                table.store(int(args[0]), int(args[1]), int(args[2]), bounds[args[3]])
+                continue
+            if command == 'newSearch':
+                table.newSearch()
+                continue
+            if command == 'lookup':
+                found = table.lookup(int(args[0]), int(args[1]), window(args[2]), window(args[3]))
+            elif command == 'boundType':
+                found = table.boundType(int(args[0]), int(args[1]), int(args[2]))
+                found = [name for name, bound in bounds.items() if bound == found][0]
+            elif command == 'len':
+                found = len(table)
+            else:
+                raise Exception('Unknown transposition table operation: %s' % line)
+            if str(found) != args[-1]:
+                return '%s: got %s' % (line, found)
+        return None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        error = self.run()
+        if error != None:
+            self.addMessage('%s' % error)
+            return self.testFail(grades)
+        return self.testPass(grades)
+
+    def writeSolution(self, moduleDict, filePath):
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# The expected results are part of the test.\n')
+        handle.close()
+        return True
+
+
+def randomPlayout(lay, seed, moves):
+    """
+    Plays random legal moves for every agent in turn from the start of the
+    layout, starting over whenever a game ends, and yields each of the
+    first moves states, the ends of the games included, with the agent to
+    move.
+    """
+    rand = random.Random(seed)
+    start = GameState()
+    start.initialize(lay, lay.getNumGhosts())
+    state, agent = start, 0
+    for move in range(moves):
+        yield state, agent
+        if state.isWin() or state.isLose():
+            state, agent = start, 0
+        else:
+            state = state.generateSuccessor(agent, rand.choice(state.getLegalActions(agent)))
+            agent = (agent + 1) % state.getNumAgents()
+
+
+class ZobristHashTest(testClasses.TestCase):
+    """
+    Plays moves random moves on layout with the given seed and checks that
+    the Zobrist hash kept up to date by the rules equals the hash computed
+    from scratch with GameStateData.computeZobrist in every state.
+    """
+
+    def __init__(self, question, testDict):
+        super(ZobristHashTest, self).__init__(question, testDict)
+        self.seed = int(testDict['seed'])
+        self.moves = int(testDict['moves'])
+        self.layout_text = testDict['layout']
+
+    def run(self):
+        lay = layout.Layout([l.strip() for l in self.layout_text.split('\n')])
+        for state, agent in randomPlayout(lay, self.seed, self.moves):
+            if state.data.zobrist != state.data.computeZobrist():
+                return 'Zobrist hash of this state is out of date:\n%s' % state
+        return None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        error = self.run()
+        if error != None:
+            self.addMessage('%s' % error)
+            return self.testFail(grades)
+        return self.testPass(grades)
+
+    def writeSolution(self, moduleDict, filePath):
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# The expected results are part of the test.\n')
+        handle.close()
+        return True
+
+
+class SuccessorSharingTest(testClasses.TestCase):
+    """
+    Plays moves random moves on layout with the given seed and generates
+    every successor of every state on the way.  The successors must leave
+    the state they came from unchanged, and must share with it the food
+    grid, the capsule list and each AgentState that their move did not
+    change instead of copying them.
+    """
+
+    def __init__(self, question, testDict):
+        super(SuccessorSharingTest, self).__init__(question, testDict)
+        self.seed = int(testDict['seed'])
+        self.moves = int(testDict['moves'])
+        self.layout_text = testDict['layout']
+
+    def run(self):
+        lay = layout.Layout([l.strip() for l in self.layout_text.split('\n')])
+        for state, agent in randomPlayout(lay, self.seed, self.moves):
+            for action in state.getLegalActions(agent):
+                before = state.deepCopy()
+                successor = state.generateSuccessor(agent, action)
+                if not (state == before and state.data.zobrist == before.data.zobrist):
+                    return 'Agent %d moving %s changed the state it moved from:\n%s' % (agent, action, before)
+
+                data = successor.data
+                if data._foodEaten is None and data.food is not state.data.food:
+                    return 'Agent %d moving %s copied the food grid without eating any food' % (agent, action)
+                if data._capsuleEaten is None and data.capsules is not state.data.capsules:
+                    return 'Agent %d moving %s copied the capsules without eating one' % (agent, action)
+                for index in range(state.getNumAgents()):
+                    changed = index == agent or (index > 0 and data._capsuleEaten is not None) or \
+                        (agent == 0 and data._eaten[index])
+                    if not changed and data.agentStates[index] is not state.data.agentStates[index]:
+                        return 'Agent %d moving %s copied the unchanged state of agent %d' % (agent, action, index)
+        return None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        error = self.run()
+        if error != None:
+            self.addMessage('%s' % error)
+            return self.testFail(grades)
+        return self.testPass(grades)
+
+    def writeSolution(self, moduleDict, filePath):
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# The expected results are part of the test.\n')
+        handle.close()
+        return True
+
+
+class ApplyUndoTest(testClasses.TestCase):
+    """
+    Plays moves random moves on layout with the given seed and plays every
+    move, and every reply to it, in place on a copy of each state on the
+    way with GameState.applyMove.  Each applyMove must give the state that
+    generateSuccessor gives, with the same hash, score and end of game, and
+    each undoMove must give back the state before it.
+    """
+
+    def __init__(self, question, testDict):
+        super(ApplyUndoTest, self).__init__(question, testDict)
+        self.seed = int(testDict['seed'])
+        self.moves = int(testDict['moves'])
+        self.layout_text = testDict['layout']
+
+    def compare(self, found, expected):
+        """
+        Returns what differs between states found and expected, or None.
+        """
+        if not found == expected:
+            return 'the state'
+        if found.data.zobrist != expected.data.zobrist:
+            return 'the hash'
+        if found.getScore() != expected.getScore():
+            return 'the score'
+        if (found.isWin(), found.isLose()) != (expected.isWin(), expected.isLose()):
+            return 'the end of the game'
+        return None
+
+    def run(self):
+        lay = layout.Layout([l.strip() for l in self.layout_text.split('\n')])
+        for state, agent in randomPlayout(lay, self.seed, self.moves):
+            board = GameState(state)
+            before = state.deepCopy()
+            for action in state.getLegalActions(agent):
+                successor = state.generateSuccessor(agent, action)
+                token = board.applyMove(agent, action)
+                difference = self.compare(board, successor)
+                if difference != None:
+                    return 'applyMove(%d, %s) changed %s unlike generateSuccessor:\n%s' % (agent, action, difference, before)
+
+                reply_agent = (agent + 1) % state.getNumAgents()
+                for reply in board.getLegalActions(reply_agent):
+                    reply_token = board.applyMove(reply_agent, reply)
+                    difference = self.compare(board, successor.generateSuccessor(reply_agent, reply))
+                    board.undoMove(reply_token)
+                    if difference == None:
+                        difference = self.compare(board, successor)
+                    if difference != None:
+                        return 'applyMove(%d, %s) and applyMove(%d, %s) got %s wrong:\n%s' % (
+                            agent, action, reply_agent, reply, difference, before)
+
+                board.undoMove(token)
+                difference = self.compare(board, before)
+                if difference == None:
+                    difference = self.compare(state, before)
+                if difference != None:
+                    return 'undoMove after applyMove(%d, %s) did not restore %s:\n%s' % (agent, action, difference, before)
+        return None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        error = self.run()
+        if error != None:
+            self.addMessage('%s' % error)
+            return self.testFail(grades)
+        return self.testPass(grades)
+
+    def writeSolution(self, moduleDict, filePath):
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# The expected results are part of the test.\n')
+        handle.close()
+        return True
+
+
+class TickingClock(object):
+    """
+    Stands in for the time module: every call of time() is one second
+    later than the one before, so a search with a deadline stops after the
+    same number of steps on every machine.
+    """
+
+    def __init__(self):
+        self.now = 0
+
+    def time(self):
+        self.now += 1
+        return self.now
+
+
+class IterativeDeepeningTest(testClasses.TestCase):
+    """
+    Plays moves random moves on layout with the given seed and asks an
+    IterativeDeepeningAgent with at most depth iterations for Pacman's
+    action in every state on the way.  Its clock ticks once a call, so
+    timeLimit is the number of times it may look at the clock.  The agent
+    must stay within that budget, finish at least the depth 1 search and
+    return an action whose minimax value at the depth it finished is the
+    best one.
+    """
+
+    def __init__(self, question, testDict):
+        super(IterativeDeepeningTest, self).__init__(question, testDict)
+        self.seed = int(testDict['seed'])
+        self.moves = int(testDict['moves'])
+        self.layout_text = testDict['layout']
+        self.depth = testDict['depth']
+        self.timeLimit = testDict['timeLimit']
+        self.ttSize = testDict.get('ttSize', '0')
+
+    def minimax(self, state, agent, depth, evaluationFunction):
+        if state.isWin() or state.isLose() or (agent == 0 and depth == 0):
+            return evaluationFunction(state)
+        next_agent = (agent + 1) % state.getNumAgents()
+        next_depth = depth - 1 if agent == 0 else depth
+        values = [self.minimax(state.generateSuccessor(agent, action), next_agent, next_depth, evaluationFunction)
+                  for action in state.getLegalActions(agent)]
+        return max(values) if agent == 0 else min(values)
+
+    def run(self, multiAgents):
+        lay = layout.Layout([l.strip() for l in self.layout_text.split('\n')])
+        agent = multiAgents.IterativeDeepeningAgent(depth=self.depth, ttSize=self.ttSize, timeLimit=self.timeLimit)
+        budget = int(float(self.timeLimit))
+        clock = TickingClock()
+        original_time = multiAgents.time
+        multiAgents.time = clock
+        try:
+            for state, turn in randomPlayout(lay, self.seed, self.moves):
+                if turn != 0 or state.isWin() or state.isLose():
+                    continue
+                start = clock.now
+                action = agent.getAction(state)
+                used = clock.now - start
+                if action not in state.getLegalActions(0):
+                    return 'Illegal action %s in state:\n%s' % (action, state)
+                # the clock is read once for the deadline and once to find it passed
+                if used > budget + 2:
+                    return 'Looked at the clock %d times with a time limit of %d in state:\n%s' % (used, budget, state)
+                depth = agent.completedDepth
+                if depth < 1:
+                    return 'Did not finish the depth 1 search in state:\n%s' % state
+                found = self.minimax(state.generateSuccessor(0, action), 1, depth - 1, agent.evaluationFunction)
+                best = self.minimax(state, 0, depth, agent.evaluationFunction)
+                if found != best:
+                    return 'Action %s has value %s at depth %d instead of %s in state:\n%s' % (
+                        action, found, depth, best, state)
+        finally:
+            multiAgents.time = original_time
+        return None
+
+    def execute(self, grades, moduleDict, solutionDict):
+        error = self.run(moduleDict['multiAgents'])
+        if error != None:
+            self.addMessage('%s' % error)
+            return self.testFail(grades)
+        return self.testPass(grades)
+
+    def writeSolution(self, moduleDict, filePath):
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('# The expected results are part of the test.\n')
+        handle.close()
+        return True
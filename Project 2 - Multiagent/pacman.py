@@ -40,9 +40,11 @@ To play your first game, type 'python pacman.py' from the command line.
 The keys are 'a', 's', 'd', and 'w' to move (or arrow keys).  Have fun!
 """
 from game import GameStateData
+from game import ZOBRIST
 from game import Game
 from game import Directions
 from game import Actions
+from game import Configuration
 from util import nearestPoint
 from util import manhattanDistance
 import util
@@ -109,29 +111,79 @@ class GameState:
 
         # Copy current state
         state = GameState(self)
+        state._applyRules(agentIndex, action)
+        GameState.explored.add(self)
+        GameState.explored.add(state)
+        return state
+
+    def applyMove(self, agentIndex, action):
+        """
+        Changes this state in place into the successor after the specified
+        agent takes the action, and returns a token for undoMove to change it
+        back.  Moves must be undone in the reverse order they were applied.
+
+        The rules replace the food, capsules and agent states they change
+        instead of writing to them, so a copy made with GameState(state) can
+        be searched this way without ever touching state:
+
+          board = GameState(gameState)
+          token = board.applyMove(0, action)
+          value = evaluate(board)
+          board.undoMove(token)
+        """
+        if self.isWin() or self.isLose():
+            raise Exception('Can\'t generate a successor of a terminal state.')
 
+        data = self.data
+        token = (tuple(data.agentStates), data.food, data.capsules, data.score, data.scoreChange, data.zobrist,
+                 data._eaten, data._ownedAgents, data._agentMoved, data._foodEaten, data._capsuleEaten)
+        data._ownedAgents = 0  # every agent state is shared with the token
+        data.scoreChange = 0
+        data._foodEaten = None
+        data._capsuleEaten = None
+        self._applyRules(agentIndex, action)
+        return token
+
+    def undoMove(self, token):
+        """
+        Changes this state back to what it was before the applyMove that
+        returned token.
+        """
+        data = self.data
+        agentStates = token[0]
+        (data.food, data.capsules, data.score, data.scoreChange, data.zobrist,
+         data._eaten, data._ownedAgents, data._agentMoved, data._foodEaten, data._capsuleEaten) = token[1:]
+        data.agentStates[:] = agentStates
+        data._win = False
+        data._lose = False
+
+    def _applyRules(self, agentIndex, action):
+        """
+        Applies the action and its effects to this state's data, which must
+        not be shared with another state.
+        """
         # Let agent's logic deal with its action's effects on the board
         if agentIndex == 0:  # Pacman is moving
-            state.data._eaten = [False for i in range(state.getNumAgents())]
-            PacmanRules.applyAction(state, action)
+            self.data._eaten = [False for i in range(self.getNumAgents())]
+            PacmanRules.applyAction(self, action)
         else:                # A ghost is moving
-            GhostRules.applyAction(state, action, agentIndex)
+            GhostRules.applyAction(self, action, agentIndex)
 
         # Time passes
         if agentIndex == 0:
-            state.data.scoreChange += -TIME_PENALTY  # Penalty for waiting around
+            self.data.scoreChange += -TIME_PENALTY  # Penalty for waiting around
         else:
-            GhostRules.decrementTimer(state.data.agentStates[agentIndex])
+            ghostState = self.data.ownAgentState(agentIndex)
+            self.data.zobrist ^= ZOBRIST.agent(agentIndex, ghostState)
+            GhostRules.decrementTimer(ghostState)
+            self.data.zobrist ^= ZOBRIST.agent(agentIndex, ghostState)
 
         # Resolve multi-agent effects
-        GhostRules.checkDeath(state, agentIndex)
+        GhostRules.checkDeath(self, agentIndex)
 
         # Book keeping
-        state.data._agentMoved = agentIndex
-        state.data.score += state.data.scoreChange
-        GameState.explored.add(self)
-        GameState.explored.add(state)
-        return state
+        self.data._agentMoved = agentIndex
+        self.data.score += self.data.scoreChange
 
     def getLegalPacmanActions(self):
         return self.getLegalActions(0)
@@ -248,7 +300,9 @@ class GameState:
 
     def __hash__(self):
         """
-        Allows states to be keys of dictionaries.
+        Allows states to be keys of dictionaries.  The Zobrist hash in
+        self.data is kept up to date as successors are generated, so this
+        takes constant time.
         """
         return hash(self.data)
 
@@ -289,6 +343,9 @@ class ClassicGameRules:
         initState.initialize(layout, len(ghostAgents))
         game = Game(agents, display, self, catchExceptions=catchExceptions)
         game.state = initState
+        for index, agent in enumerate(agents):
+            if hasattr(agent, 'setMoveTimeout'):  # agents that search until a deadline
+                agent.setMoveTimeout(self.getMoveTimeout(index))
         self.initialState = initState.deepCopy()
         self.quiet = quiet
         return game
@@ -348,7 +405,7 @@ class PacmanRules:
         """
         Returns a list of possible actions.
         """
-        return Actions.getPossibleActions(state.getPacmanState().configuration, state.data.layout.walls)
+        return state.data.layout.getPossibleActions(state.getPacmanState().configuration)
     getLegalActions = staticmethod(getLegalActions)
 
     def applyAction(state, action):
@@ -359,12 +416,14 @@ class PacmanRules:
         if action not in legal:
             raise Exception("Illegal action " + str(action))
 
-        pacmanState = state.data.agentStates[0]
+        pacmanState = state.data.ownAgentState(0)
 
         # Update Configuration
         vector = Actions.directionToVector(action, PacmanRules.PACMAN_SPEED)
+        state.data.zobrist ^= ZOBRIST.agent(0, pacmanState)
         pacmanState.configuration = pacmanState.configuration.generateSuccessor(
             vector)
+        state.data.zobrist ^= ZOBRIST.agent(0, pacmanState)
 
         # Eat
         next = pacmanState.configuration.getPosition()
@@ -381,6 +440,7 @@ class PacmanRules:
             state.data.scoreChange += 10
             state.data.food = state.data.food.copy()
             state.data.food[x][y] = False
+            state.data.zobrist ^= ZOBRIST.food(x, y)
             state.data._foodEaten = position
             # TODO: cache numFood?
             numFood = state.getNumFood()
@@ -389,11 +449,15 @@ class PacmanRules:
                 state.data._win = True
         # Eat capsule
         if(position in state.getCapsules()):
-            state.data.capsules.remove(position)
+            state.data.capsules = [capsule for capsule in state.data.capsules if capsule != position]
+            state.data.zobrist ^= ZOBRIST.capsule(position)
             state.data._capsuleEaten = position
             # Reset all ghosts' scared timers
             for index in range(1, len(state.data.agentStates)):
-                state.data.agentStates[index].scaredTimer = SCARED_TIME
+                ghostState = state.data.ownAgentState(index)
+                state.data.zobrist ^= ZOBRIST.agent(index, ghostState)
+                ghostState.scaredTimer = SCARED_TIME
+                state.data.zobrist ^= ZOBRIST.agent(index, ghostState)
     consume = staticmethod(consume)
 
 
@@ -409,8 +473,7 @@ class GhostRules:
         reach a dead end, but can turn 90 degrees at intersections.
         """
         conf = state.getGhostState(ghostIndex).configuration
-        possibleActions = Actions.getPossibleActions(
-            conf, state.data.layout.walls)
+        possibleActions = state.data.layout.getPossibleActions(conf)
         reverse = Actions.reverseDirection(conf.direction)
         if Directions.STOP in possibleActions:
             possibleActions.remove(Directions.STOP)
@@ -425,20 +488,23 @@ class GhostRules:
         if action not in legal:
             raise Exception("Illegal ghost action " + str(action))
 
-        ghostState = state.data.agentStates[ghostIndex]
+        ghostState = state.data.ownAgentState(ghostIndex)
         speed = GhostRules.GHOST_SPEED
         if ghostState.scaredTimer > 0:
             speed /= 2.0
         vector = Actions.directionToVector(action, speed)
+        state.data.zobrist ^= ZOBRIST.agent(ghostIndex, ghostState)
         ghostState.configuration = ghostState.configuration.generateSuccessor(
             vector)
+        state.data.zobrist ^= ZOBRIST.agent(ghostIndex, ghostState)
     applyAction = staticmethod(applyAction)
 
     def decrementTimer(ghostState):
         timer = ghostState.scaredTimer
         if timer == 1:
-            ghostState.configuration.pos = nearestPoint(
-                ghostState.configuration.pos)
+            # A new Configuration: the old one may be shared with the parent state
+            ghostState.configuration = Configuration(
+                nearestPoint(ghostState.configuration.pos), ghostState.configuration.direction)
         ghostState.scaredTimer = max(0, timer - 1)
     decrementTimer = staticmethod(decrementTimer)
 
@@ -460,9 +526,13 @@ class GhostRules:
     def collide(state, ghostState, agentIndex):
         if ghostState.scaredTimer > 0:
             state.data.scoreChange += 200
+            ghostState = state.data.ownAgentState(agentIndex)
+            state.data.zobrist ^= ZOBRIST.agent(agentIndex, ghostState)
             GhostRules.placeGhost(state, ghostState)
             ghostState.scaredTimer = 0
+            state.data.zobrist ^= ZOBRIST.agent(agentIndex, ghostState)
             # Added for first-person
+            state.data._eaten = state.data._eaten[:]
             state.data._eaten[agentIndex] = True
         else:
             if not state.data._win:
@@ -233,6 +233,98 @@ class PriorityQueueWithFunction(PriorityQueue):
         PriorityQueue.push(self, item, self.priorityFunction(item))
 
 
+class TranspositionTable:
+    """
+    A fixed number of slots holding search results, so that a game tree
+    search can reuse the value of a position it already searched after
+    reaching it again through a different order of moves.
+
+    Each slot keeps (key, depth, value, bound).  bound says what the value
+    is worth when it came out of an alpha-beta window: EXACT values are the
+    true value of the position, LOWER values only say the true value is at
+    least this large (the search was cut off above beta) and UPPER values
+    that it is at most this large (the search was cut off below alpha).
+
+    A key maps to one slot; when two keys share a slot the new result
+    replaces the old one if it comes from a later search or from a search
+    at least as deep, so the most expensive results of a search survive.
+    probes, hits, stores and replacements are counted for hitRate().
+    """
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+    def __init__(self, size=65536):
+        if size <= 0:
+            raise ValueError('a transposition table needs at least one slot')
+        self.size = size
+        self.slots = [None] * size
+        self.generations = [0] * size
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def newSearch(self):
+        "Marks the results stored so far as older than the ones that follow"
+        self.generation += 1
+
+    def lookup(self, key, depth, alpha=None, beta=None):
+        """
+        Returns the stored value of key searched to exactly depth if it can
+        stand in for a search with the window (alpha, beta), and None
+        otherwise.  Bounds are only used when they fall strictly outside
+        the window, which is what the alpha-beta cut offs test for.
+        """
+        self.probes += 1
+        entry = self.slots[hash(key) % self.size]
+        if entry is None or entry[0] != key or entry[1] != depth:
+            return None
+        value, bound = entry[2], entry[3]
+        if (bound == self.EXACT or
+                (bound == self.LOWER and beta is not None and value > beta) or
+                (bound == self.UPPER and alpha is not None and value < alpha)):
+            self.hits += 1
+            return value
+        return None
+
+    def store(self, key, depth, value, bound=EXACT):
+        index = hash(key) % self.size
+        entry = self.slots[index]
+        if entry is not None and entry[0] != key:
+            if self.generations[index] == self.generation and entry[1] > depth:
+                return
+            self.replacements += 1
+        self.slots[index] = (key, depth, value, bound)
+        self.generations[index] = self.generation
+        self.stores += 1
+
+    def boundType(self, value, alpha, beta):
+        "The bound of a value returned by a search with the window (alpha, beta)"
+        if value < alpha:
+            return self.UPPER
+        if value > beta:
+            return self.LOWER
+        return self.EXACT
+
+    def hitRate(self):
+        if self.probes == 0:
+            return 0.0
+        return self.hits / self.probes
+
+    def clear(self):
+        self.slots = [None] * self.size
+        self.generations = [0] * self.size
+
+    def __len__(self):
+        return self.size - self.slots.count(None)
+
+    def __str__(self):
+        return 'TranspositionTable(%d/%d slots, %d probes, %.1f%% hits, %d stores, %d replacements)' % (
+            len(self), self.size, self.probes, 100.0 * self.hitRate(), self.stores, self.replacements)
+
+
 def manhattanDistance(xy1, xy2):
     "Returns the Manhattan distance between points xy1 and xy2"
     return abs(xy1[0] - xy2[0]) + abs(xy1[1] - xy2[1])
@@ -14,6 +14,9 @@
 
 from util import manhattanDistance
 from game import Grid
+from game import PackedGrid
+from game import Actions
+from game import Directions
 import os
 import random
 from functools import reduce
@@ -30,12 +33,13 @@ class Layout:
         self.width = len(layoutText[0])
         self.height = len(layoutText)
         self.walls = Grid(self.width, self.height, False)
-        self.food = Grid(self.width, self.height, False)
+        self.food = PackedGrid(self.width, self.height, False)
         self.capsules = []
         self.agentPositions = []
         self.numGhosts = 0
         self.processLayoutText(layoutText)
         self.layoutText = layoutText
+        self._successorTable = None
         self.totalFood = len(self.food.asList())
         # self.initializeVisibilityMatrix()
 
@@ -67,6 +71,52 @@ class Layout:
         x, col = pos
         return self.walls[x][col]
 
+
+    def getSuccessorTable(self):
+        """
+        Returns the static move table of this layout, built on first use:
+          cells:      the open cells, in column-major order
+          index:      a dict from open cell to its position in cells
+          actions:    for each cell, the legal actions (STOP included), in
+                      the order Actions.getPossibleActions lists them
+          successors: for each cell, the (neighbor, action) pairs for the
+                      moves north, south, east and west that stay open
+        Walls never change during a game, so this replaces the per call
+        vector arithmetic and wall lookups with a single dict lookup.
+        """
+        if self._successorTable is None:
+            cells = self.walls.asList(False)
+            index = {cell: i for i, cell in enumerate(cells)}
+            actions, successors = [], []
+            for x, y in cells:
+                actions.append(tuple(direction for direction, (dx, dy) in Actions._directionsAsList
+                                     if (x + dx, y + dy) in index))
+                moves = []
+                for direction in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
+                    dx, dy = Actions._directions[direction]
+                    if (x + dx, y + dy) in index:
+                        moves.append(((x + dx, y + dy), direction))
+                successors.append(tuple(moves))
+            self._successorTable = (cells, index, actions, successors)
+        return self._successorTable
+
+    def getSuccessors(self, pos):
+        "Returns the (neighbor, action) pairs reachable in one move from the open cell pos."
+        _, index, _, successors = self.getSuccessorTable()
+        return successors[index[pos]]
+
+    def getPossibleActions(self, config):
+        "Table driven equivalent of Actions.getPossibleActions(config, self.walls)."
+        x, y = config.pos
+        x_int, y_int = int(x + 0.5), int(y + 0.5)
+
+        # In between grid points, all agents must continue straight
+        if abs(x - x_int) + abs(y - y_int) > Actions.TOLERANCE:
+            return [config.getDirection()]
+
+        _, index, actions, _ = self.getSuccessorTable()
+        return list(actions[index[(x_int, y_int)]])
+
     def get_all_coords_list(self):
         all_coords_list = []
         for x in range(self.width):
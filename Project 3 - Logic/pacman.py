@@ -357,7 +357,7 @@ class PacmanRules:
         """
         Returns a list of possible actions.
         """
-        return Actions.getPossibleActions(state.getPacmanState().configuration, state.data.layout.walls)
+        return state.data.layout.getPossibleActions(state.getPacmanState().configuration)
     getLegalActions = staticmethod(getLegalActions)
 
     def applyAction(state, action):
@@ -420,7 +420,7 @@ class GhostRules:
         reach a dead end, but can turn 90 degrees at intersections.
         """
         conf = state.getGhostState(ghostIndex).configuration
-        possibleActions = Actions.getPossibleActions(conf, state.data.layout.walls)
+        possibleActions = state.data.layout.getPossibleActions(conf)
         reverse = Actions.reverseDirection(conf.direction)
 
         # PMV